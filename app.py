@@ -1,18 +1,105 @@
-from flask import Flask, render_template, request
+import asyncio
+import gzip
+import hashlib
+import math
+import os
+
+from flask import Flask, Response, jsonify, render_template, request
+import metrics
+from cache import LRUCache, SingleFlight
 from expertsystem import SistemPakarLaptop
+from reloader import DatasetReloader
+
+try:
+    import brotli  # opsional; tanpa paket ini halaman hanya dikompres gzip
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 
+# Query identik yang sedang diproses bersamaan dihitung sekali saja
+coalescer = SingleFlight()
+
+# Halaman hasil yang sudah dirender & dikompres, per (versi dataset, parameter form ternormalisasi)
+page_cache = LRUCache(max_items=1024, max_bytes=32 * 1024 * 1024)
+
 # Inisialisasi Sistem Pakar
 FILENAME = "dataset_final_super_lengkap.csv"
-try:
-    sistem = SistemPakarLaptop(FILENAME)
+# shared=True: katalog dibaca dari snapshot mmap sehingga worker gunicorn berbagi memori yang sama.
+# Jika file dataset berubah, sistem baru dibangun di thread latar lalu ditukar tanpa menghentikan request.
+reloader = DatasetReloader(FILENAME, lambda path: SistemPakarLaptop(path, shared=True),
+                           interval=float(os.environ.get("LAPTOP_RELOAD_INTERVAL", 5)))
+if reloader.load():
     print("Sistem Pakar Berhasil Dimuat!")
-except Exception as e:
-    print(f"Error memuat sistem: {e}")
+
+DATA_BELUM_SIAP = "Data laptop belum tersedia, silakan coba beberapa saat lagi."
+
+def _label_metrics(sistem, kategori, sub_kategori, sort_option):
+    # Label histogram dibatasi ke nilai yang dikenal agar input bebas tidak menambah seri metrik tanpa batas
+    if sistem is None: return "unavailable", "unavailable", "unavailable"
+    if not kategori: return "none", "none", "none"
+    if kategori not in sistem.rules: return "invalid", "invalid", "invalid"
+    if kategori == "SHOW_ALL": sub_kategori = "all"
+    if sub_kategori not in sistem.rules[kategori]: sub_kategori = "invalid"
+    if sort_option not in ("lowest_price", "highest_price", "best_value"): sort_option = "score"
+    return kategori, sub_kategori, sort_option
+
+_brands = (None, [])
+
+def _brands_list(sistem):
+    # Dropdown brand cukup disusun sekali per sistem (per versi dataset), bukan per request
+    global _brands
+    if _brands[0] is not sistem: _brands = (sistem, sorted(sistem.get_brands()))
+    return _brands[1]
+
+def _kunci_halaman(sistem):
+    # Semua nilai yang mempengaruhi HTML, dalam bentuk yang sudah dinormalisasi seperti di _render_index
+    if sistem is None: return None
+    if request.method != 'POST': return (sistem.versi, 'GET')
+    form = request.form
+    raw_budget = form.get('budget', '').replace('.', '').replace(',', '')
+    try:
+        budget = int(raw_budget) if raw_budget else 0
+        page = int(form.get('page', 1))
+    except ValueError:
+        return None  # input tidak valid: render biasa tanpa cache
+    return (sistem.versi, budget, form.get('category'), form.get('sub_category'), form.get('search_query', ''),
+            form.get('brand_filter', 'ALL'), page, form.get('sort_option', 'score'))
+
+def _kompres(html):
+    # (gzip, brotli atau None); versi tanpa kompresi cukup didekompres saat klien tidak mendukung gzip
+    with metrics.span("compress"):
+        data = html.encode('utf-8')
+        return gzip.compress(data, compresslevel=6), brotli.compress(data) if brotli else None
+
+def _kirim_halaman(entry):
+    gz, br = entry
+    terima = request.accept_encodings
+    if br is not None and terima['br']: body, encoding = br, 'br'
+    elif terima['gzip']: body, encoding = gz, 'gzip'
+    else: body, encoding = gzip.decompress(gz), None
+    resp = Response(body, mimetype='text/html')
+    if encoding: resp.headers['Content-Encoding'] = encoding
+    resp.vary.add('Accept-Encoding')
+    return resp
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
+    # Satu referensi per request: reload di tengah request tidak mengubah data yang sedang dipakai
+    sistem = reloader.current()
+    form = request.form
+    with metrics.request("index", *_label_metrics(sistem, form.get('category'), form.get('sub_category'), form.get('sort_option', 'score'))):
+        # Query berulang & pindah halaman yang pernah dibuka langsung dikirim dari cache (sudah terkompres)
+        kunci = _kunci_halaman(sistem)
+        entry = page_cache.get(kunci) if kunci is not None else None
+        if entry is None:
+            html, boleh_cache = _render_index(sistem)
+            entry = _kompres(html)
+            if kunci is not None and boleh_cache: page_cache.put(kunci, entry)
+        return _kirim_halaman(entry)
+
+def _render_index(sistem):
+    # -> (html, boleh di-cache); error internal tidak di-cache agar request berikutnya mencoba lagi
     # Variables for template
     result_data = []
     error_msg = None
@@ -26,8 +113,11 @@ def index():
     current_page = 1
     total_pages = 1
     sort_option = "score" 
+    boleh_cache = sistem is not None
 
-    if request.method == 'POST':
+    if sistem is None:
+        error_msg = DATA_BELUM_SIAP
+    elif request.method == 'POST':
         try:
             # 1. Ambil Parameter Dasar
             raw_budget = request.form.get('budget', '').replace('.', '').replace(',', '')
@@ -74,23 +164,132 @@ def index():
             error_msg = str(ve) if str(ve) else "Mohon masukkan data yang valid."
         except Exception as e:
             error_msg = f"Internal Error: {e}"
+            boleh_cache = False
 
     # Kirim daftar brand ke template untuk dropdown
-    brands_list = sistem.get_brands()
-    brands_list.sort()
-
-    return render_template('index.html', 
-                           recommendations=result_data, 
-                           error=error_msg,
-                           last_budget=input_budget,
-                           last_cat=selected_cat,
-                           last_sub=selected_sub,
-                           last_search=search_query,    # NEW
-                           last_brand=selected_brand,   # NEW
-                           current_page=current_page,
-                           total_pages=total_pages,
-                           current_sort=sort_option,
-                           brands=brands_list)          # NEW
+    brands_list = _brands_list(sistem) if sistem is not None else []
+
+    with metrics.span("render_template"):
+        html = render_template('index.html', 
+                               recommendations=result_data, 
+                               error=error_msg,
+                               last_budget=input_budget,
+                               last_cat=selected_cat,
+                               last_sub=selected_sub,
+                               last_search=search_query,    # NEW
+                               last_brand=selected_brand,   # NEW
+                               current_page=current_page,
+                               total_pages=total_pages,
+                               current_sort=sort_option,
+                               brands=brands_list)          # NEW
+    return html, boleh_cache
+
+def _api_teks(params, nama, default=None):
+    # Field teks boleh kosong (null), tapi tipe lain (list/angka) ditolak agar tidak sampai ke lookup rule & cache
+    nilai = params.get(nama, default)
+    if nilai is not None and not isinstance(nilai, str):
+        raise ValueError(f"Field '{nama}' harus berupa teks.")
+    return nilai
+
+
+def _api_angka(params, nama, default):
+    # Angka JSON dibaca apa adanya; string (query string GET) diparse seperti input form
+    nilai = params.get(nama, default)
+    if isinstance(nilai, str):
+        if nama == 'budget':
+            nilai = nilai.replace('.', '').replace(',', '')
+            return int(nilai) if nilai else 0
+        return int(nilai)
+    if isinstance(nilai, bool) or not isinstance(nilai, (int, float)) or not math.isfinite(nilai):
+        raise ValueError(f"Field '{nama}' harus berupa angka.")
+    return int(nilai)
+
+
+def _api_query(params):
+    # Ubah parameter JSON (nama field sama dengan form) menjadi kwargs sistem.rekomendasi
+    if not isinstance(params, dict):
+        raise ValueError("Setiap query harus berupa object JSON.")
+    return {
+        "user_budget_idr": _api_angka(params, 'budget', ''),
+        "user_kategori": _api_teks(params, 'category'),
+        "user_sub_kategori": _api_teks(params, 'sub_category'),
+        "search_query": _api_teks(params, 'search_query', ''),
+        "brand_filter": _api_teks(params, 'brand_filter', 'ALL'),
+        "sort_option": _api_teks(params, 'sort_option', 'score'),
+        "page": _api_angka(params, 'page', 1),
+        "per_page": min(max(_api_angka(params, 'per_page', 24), 1), 100),
+    }
+
+
+def _json_safe(hasil):
+    # NaN (mis. link kosong) bukan JSON valid, ganti dengan null
+    for row in hasil['data']:
+        for k, v in row.items():
+            if isinstance(v, float) and math.isnan(v): row[k] = None
+    return hasil
+
+
+def _rekomendasi_api(sistem, kwargs):
+    # Dijalankan di thread worker, sehingga timing & profiler sampling mengikuti thread yang benar-benar menghitung
+    label = _label_metrics(sistem, kwargs['user_kategori'], kwargs['user_sub_kategori'], kwargs['sort_option'])
+    with metrics.request("api", *label):
+        return _json_safe(sistem.rekomendasi(**kwargs))
+
+
+@app.route('/api/recommend', methods=['GET'])
+async def api_recommend():
+    sistem = reloader.current()
+    if sistem is None:
+        return jsonify({"error": DATA_BELUM_SIAP}), 503
+    try:
+        kwargs = _api_query(request.args.to_dict())
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e) or "Mohon masukkan data yang valid."}), 400
+
+    # Hasil hanya bergantung pada versi data + query, jadi ETag bisa dicek sebelum menghitung apa pun
+    key = (sistem.versi, tuple(sorted(kwargs.items())))
+    etag = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        hasil = await asyncio.to_thread(coalescer.do, key, lambda: _rekomendasi_api(sistem, kwargs))
+        resp = jsonify(hasil)
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
+
+@app.route('/api/recommend/batch', methods=['POST'])
+def recommend_batch():
+    sistem = reloader.current()
+    if sistem is None:
+        return jsonify({"error": DATA_BELUM_SIAP}), 503
+    payload = request.get_json(silent=True)
+    queries = payload.get('queries') if isinstance(payload, dict) else None
+    if not isinstance(queries, list):
+        return jsonify({"error": "Body JSON harus berisi list 'queries'."}), 400
+    try:
+        kwargs = [_api_query(q) for q in queries]
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e) or "Mohon masukkan data yang valid."}), 400
+
+    hasil = sistem.rekomendasi_batch(kwargs)
+    return jsonify({"results": [_json_safe(h) for h in hasil]})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    # Format teks Prometheus; cache ranking & coalescing ikut dilaporkan sebagai gauge
+    sistem = reloader.current()
+    cache = metrics.Gauge("laptop_ranking_cache", "Statistik cache ranking", ("stat",))
+    if sistem is not None:
+        for k, v in sistem.ranking_cache.stats().items(): cache.set(v, k)
+    halaman = metrics.Gauge("laptop_page_cache", "Statistik cache halaman hasil (HTML terkompres)", ("stat",))
+    for k, v in page_cache.stats().items(): halaman.set(v, k)
+    coalesced = metrics.Gauge("laptop_coalesced_requests", "Request API yang menunggu hasil request identik", ())
+    coalesced.set(coalescer.coalesced)
+    versi = metrics.Gauge("laptop_dataset_version", "Jumlah swap dataset sejak proses dimulai", ())
+    versi.set(reloader.versi)
+    return Response(metrics.render([cache, halaman, coalesced, versi]), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,6 @@
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app
+
+# Entry point ASGI, mis.: uvicorn asgi:asgi_app --workers 4
+asgi_app = WsgiToAsgi(app)
@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from expertsystem import SistemPakarLaptop
+
+SORTS = ["score", "lowest_price", "highest_price", "best_value"]
+SEARCHES = ["legion", "pro 14", "rtx", "a"]  # "a" terlalu pendek untuk trigram -> jalur scan
+BUDGET = 50_000_000
+# Selisih p50 di bawah ini dianggap noise saat membandingkan dengan baseline
+NOISE_FLOOR = 0.001
+
+# Potongan nilai untuk katalog sintetis (kolom mentah sama dengan dataset_final_super_lengkap.csv)
+BRANDS = ["HP", "Lenovo", "Dell", "ASUS", "Acer", "MSI", "LG", "Alienware", "Samsung", "Microsoft",
+          "Apple", "Razer", "Gigabyte", "Dynabook", "Axioo", "Infinix", "Xiaomi"]
+SERIES = ["Legion 5", "ROG Strix G16", "Pavilion 14", "IdeaPad Slim 3", "Aspire 7", "Katana 15", "Gram 16",
+          "Galaxy Book3", "Surface Laptop 5", "MacBook Pro 14", "Blade 15", "Nitro V", "TUF F15", "Zenbook 14"]
+CPUS = ["Intel Core i5-12450H", "Intel Core i7-13700H", "AMD Ryzen 5 7535HS", "AMD Ryzen 7 7840HS",
+        "Apple M2", "Intel Core Ultra 7 155H", "Intel Core i3-1215U"]
+GPUS = ["NVIDIA GeForce RTX 4060", "NVIDIA GeForce RTX 3050", "Intel Iris Xe", "AMD Radeon 680M",
+        "NVIDIA GeForce RTX 4090", "Intel UHD Graphics"]
+DISPLAYS = ["15.6 inch FHD IPS", "15.6 inch FHD 144Hz IPS", "16 inch QHD+ 165 Hz", "14 inch 2.8K 90hz OLED",
+            "17.3 inch FHD 240HZ", "13.3 inch Retina", "16 inch WQXGA 120Hz"]
+
+
+def generate_catalog(n, seed=0):
+    # Katalog sintetis n baris dengan format mentah yang sama seperti CSV asli (harga bercampur "$1,299.99")
+    rng = np.random.default_rng(seed)
+    pick = lambda values: np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+    nama = pd.Series(pick(BRANDS)) + " " + pd.Series(pick(SERIES)) + " " + pd.Series(rng.integers(1, 999, n)).astype(str)
+    nama[rng.random(n) < 0.01] = np.nan
+
+    harga = np.round(rng.uniform(250, 4500, n), 2)
+    harga_txt = pd.Series(harga).map("${:,.2f}".format)
+    harga_col = np.where(rng.random(n) < 0.3, harga_txt.to_numpy(), harga.astype(str))
+
+    ids = pd.Series(np.arange(n)).astype(str)
+    return pd.DataFrame({
+        "Nama_Laptop": nama,
+        "Harga_USD": harga_col,
+        "CPU_Score": rng.choice([9000, 12000, 16225, 17216, 25368, 30562, 34000, 0], n),
+        "GPU_Score": rng.choice([1230, 2500, 3836, 6906, 10142, 17399, 26000], n),
+        "RAM_Clean": rng.choice([4, 8, 16, 32, 64], n),
+        "Storage": pick(["256", "512", "1024 GB", "2048", ""]),
+        "Screen_Score": rng.choice([60, 70, 80, 85, 120, 130], n),
+        "Processor": pick(CPUS),
+        "GPU": pick(GPUS),
+        "Display": pick(DISPLAYS),
+        "Detail_URL": "https://example.com/laptop/" + ids,
+        "Buy_Link": np.where(rng.random(n) < 0.8, ("https://shop.example.com/p/" + ids).to_numpy(), "0"),
+    })
+
+
+def write_catalog(n, seed=0, path=None):
+    path = path or os.path.join(tempfile.gettempdir(), f"bench_katalog_{n}_{seed}.csv")
+    if not os.path.exists(path):
+        generate_catalog(n, seed).to_csv(path, index=False)
+    return path
+
+
+def stats(waktu, peak=None):
+    # Ringkasan satu skenario (detik); peak = puncak alokasi Python/NumPy (tracemalloc) dalam MB
+    waktu = np.asarray(waktu)
+    hasil = {"n": len(waktu), "p50": float(np.percentile(waktu, 50)), "p99": float(np.percentile(waktu, 99)),
+             "mean": float(waktu.mean())}
+    if peak is not None: hasil["peak_mb"] = peak / 2 ** 20
+    return hasil
+
+
+def ukur(fungsi, repeat, setup=None):
+    waktu = []
+    for _ in range(repeat):
+        if setup: setup()
+        t = time.perf_counter()
+        fungsi()
+        waktu.append(time.perf_counter() - t)
+    return waktu
+
+
+def peak_memory(fungsi, setup=None):
+    # Dijalankan terpisah dari pengukuran waktu karena tracemalloc memperlambat alokasi
+    if setup: setup()
+    tracemalloc.start()
+    try:
+        fungsi()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_load(path, repeat=3):
+    # Waktu _load_and_clean_data + build index (tanpa snapshot) dan waktu start dari snapshot
+    hasil = {}
+    tanpa = lambda: SistemPakarLaptop(path, use_snapshot=False)
+    hasil["load/csv"] = stats(ukur(tanpa, repeat), peak_memory(tanpa))
+
+    SistemPakarLaptop(path)  # pastikan snapshot ada
+    dengan = lambda: SistemPakarLaptop(path)
+    hasil["load/snapshot"] = stats(ukur(dengan, repeat), peak_memory(dengan))
+    shared = lambda: SistemPakarLaptop(path, shared=True)
+    hasil["load/shared"] = stats(ukur(shared, repeat), peak_memory(shared))
+    return hasil
+
+
+def query_scenarios(sistem):
+    # (nama skenario, kwargs rekomendasi) untuk tiap rule x sort, pagination dalam, search & brand
+    for kategori, subs in sistem.rules.items():
+        for sub in subs:
+            for sort in SORTS:
+                yield f"rule/{kategori}/{sub}/{sort}", dict(user_kategori=kategori, user_sub_kategori=sub, sort_option=sort)
+
+    dasar = dict(user_kategori="GAMING_BERAT", user_sub_kategori="indie", sort_option="score")
+    total = sistem.rekomendasi(BUDGET, **dasar, per_page=24)["total_pages"]
+    for page in sorted({1, 10, 100, max(total // 2, 1), max(total, 1)}):
+        yield f"page/{page}", dict(dasar, page=page)
+
+    for q in SEARCHES:
+        yield f"search/{q}", dict(dasar, search_query=q)
+    for brand in ["ASUS", "Apple", "Zotac"]:
+        yield f"brand/{brand}", dict(dasar, brand_filter=brand)
+    yield "search+brand/rtx/ASUS", dict(dasar, search_query="rtx", brand_filter="ASUS")
+
+
+def bench_query(sistem, repeat=20, pola=None):
+    # Cold path: cache ranking dikosongkan sebelum tiap panggilan agar seluruh pipeline terukur
+    hasil = {}
+    for nama, kwargs in query_scenarios(sistem):
+        if pola and pola not in nama: continue
+        kwargs = dict(kwargs, per_page=24)
+        jalankan = lambda: sistem.rekomendasi(BUDGET, **kwargs)
+        hasil[nama] = stats(ukur(jalankan, repeat, sistem.ranking_cache.clear),
+                            peak_memory(jalankan, sistem.ranking_cache.clear))
+
+    # Warm path: halaman berikutnya dari ranking yang sudah ada di cache
+    dasar = dict(user_kategori="GAMING_BERAT", user_sub_kategori="indie", per_page=24)
+    halaman = iter(range(1, 10 ** 9))
+    sistem.ranking_cache.clear()
+    hasil["warm/next_page"] = stats(ukur(lambda: sistem.rekomendasi(BUDGET, **dasar, page=next(halaman)), repeat))
+    return hasil
+
+
+def _hasil_sama(a, b):
+    # Bandingkan output rekomendasi nilai per nilai (NaN == NaN), termasuk tipe Python tiap sel
+    if a.keys() != b.keys() or len(a["data"]) != len(b["data"]): return False
+    if any(a[k] != b[k] for k in a if k != "data"): return False
+    for r1, r2 in zip(a["data"], b["data"]):
+        if r1.keys() != r2.keys(): return False
+        for c in r1:
+            x, y = r1[c], r2[c]
+            if type(x) is not type(y): return False
+            if x != y and not (isinstance(x, float) and np.isnan(x) and np.isnan(y)): return False
+    return True
+
+
+def bench_memory(path, repeat=3):
+    # Memori katalog normal vs compact (per kolom) + cek paritas hasil rekomendasi di semua skenario query
+    normal, compact = SistemPakarLaptop(path), SistemPakarLaptop(path, compact=True)
+    rep_normal, rep_compact = normal.memory_report(), compact.memory_report()
+    tabel = rep_normal.merge(rep_compact, on="kolom", how="outer", suffixes=("_normal", "_compact"))
+    print(f"{'kolom':<24} {'dtype normal':>14} {'MB':>8} {'dtype compact':>14} {'MB':>8}")
+    for _, r in tabel.iterrows():
+        print(f"{r['kolom']:<24} {str(r['dtype_normal']):>14} {r['MB_normal']:>8.2f} "
+              f"{str(r['dtype_compact']):>14} {r['MB_compact']:>8.2f}")
+
+    beda = []
+    for nama, kwargs in query_scenarios(normal):
+        for page in (1, 2):
+            kw = dict(kwargs, per_page=24, page=kwargs.get("page", page))
+            if not _hasil_sama(normal.rekomendasi(BUDGET, **kw), compact.rekomendasi(BUDGET, **kw)): beda.append(nama)
+    for nama in beda: print(f"PARITAS GAGAL {nama}")
+
+    hasil = {}
+    for label, kwargs, rep in (("normal", {}, rep_normal), ("compact", {"compact": True}, rep_compact)):
+        muat = lambda: SistemPakarLaptop(path, **kwargs)
+        hasil[f"memory/{label}"] = dict(stats(ukur(muat, repeat), peak_memory(muat)),
+                                        data_mb=float(rep["MB"].sum()), parity_errors=len(beda))
+    return hasil
+
+
+def random_form(sistem, rng):
+    kategori = rng.choice(list(sistem.rules))
+    form = {"budget": str(rng.choice([8_000_000, 15_000_000, 25_000_000, BUDGET])), "category": kategori,
+            "sub_category": rng.choice(list(sistem.rules[kategori])), "sort_option": rng.choice(SORTS),
+            "page": str(rng.choice([1, 1, 1, 2, 3, 10]))}
+    if rng.random() < 0.2: form["search_query"] = rng.choice(SEARCHES)
+    if rng.random() < 0.2: form["brand_filter"] = rng.choice(["ASUS", "Lenovo", "HP", "Apple"])
+    return form
+
+
+def bench_http(path, clients=8, requests=100, seed=0):
+    # Load generator lokal: beberapa client konkuren memanggil app.index lewat Flask test client (WSGI penuh)
+    import app as web
+    web.reloader.swap(SistemPakarLaptop(path, shared=True))
+    web.reloader.interval = 0  # tanpa watcher selama benchmark
+    forms = [[random_form(web.reloader.sistem, random.Random(seed * 1000 + c)) for _ in range(requests)] for c in range(clients)]
+    waktu = [[] for _ in range(clients)]
+    ukuran = [[] for _ in range(clients)]
+    gagal = []
+
+    def client(c):
+        tc = web.app.test_client()
+        for form in forms[c]:
+            t = time.perf_counter()
+            resp = tc.post('/', data=form, headers={"Accept-Encoding": "gzip"})
+            waktu[c].append(time.perf_counter() - t)
+            ukuran[c].append(len(resp.data))
+            if resp.status_code != 200: gagal.append(resp.status_code)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    t = time.perf_counter()
+    for th in threads: th.start()
+    for th in threads: th.join()
+    durasi = time.perf_counter() - t
+
+    hasil = stats([w for ws in waktu for w in ws])
+    hasil.update({"clients": clients, "rps": clients * requests / durasi, "errors": len(gagal),
+                  "kb_per_response": sum(map(sum, ukuran)) / max(clients * requests, 1) / 1024})
+    return {"http/index": hasil}
+
+
+def compare(hasil, baseline, tolerance):
+    # Regresi = p50 lebih lambat dari baseline melebihi toleransi (dan di atas noise floor)
+    regresi = []
+    for nama, base in baseline.get("results", {}).items():
+        baru = hasil["results"].get(nama)
+        if baru is None: continue
+        if baru["p50"] > base["p50"] * (1 + tolerance) and baru["p50"] - base["p50"] > NOISE_FLOOR:
+            regresi.append((nama, base["p50"], baru["p50"]))
+    return regresi
+
+
+def report(hasil):
+    print(f"{'skenario':<56} {'n':>4} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8}")
+    for nama, s in hasil["results"].items():
+        peak = f"{s['peak_mb']:.1f}" if "peak_mb" in s else "-"
+        print(f"{nama:<56} {s['n']:>4} {s['p50'] * 1000:>9.2f} {s['p99'] * 1000:>9.2f} {peak:>8}")
+        if "data_mb" in s: print(f"{'':<56} katalog+index {s['data_mb']:.1f} MB, {s['parity_errors']} beda hasil")
+        if "rps" in s: print(f"{'':<56} {s['clients']} client, {s['rps']:.1f} req/s, {s['errors']} error, "
+                             f"{s.get('kb_per_response', 0):.1f} KB/respons")
+    print(f"rows={hasil['rows']}  max RSS={hasil['max_rss_mb']:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sistem pakar laptop")
+    parser.add_argument("mode", choices=["load", "query", "http", "memory", "all"])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="ukuran katalog sintetis (mis. 10000 - 5000000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="pakai CSV ini alih-alih katalog sintetis")
+    parser.add_argument("--repeat", type=int, default=None, help="ulangan per skenario (default: load 3, query 20)")
+    parser.add_argument("--filter", help="hanya skenario query yang namanya mengandung teks ini")
+    parser.add_argument("--shared", action="store_true", help="mode query memakai katalog mmap (seperti app.py)")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="request per client (mode http)")
+    parser.add_argument("--output", help="simpan hasil (JSON)")
+    parser.add_argument("--save-baseline", help="simpan hasil sebagai baseline (JSON)")
+    parser.add_argument("--baseline", help="bandingkan dengan baseline ini; exit code 1 jika ada regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="toleransi perlambatan p50 (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    if args.csv and not os.path.isfile(args.csv):
+        parser.error(f"file --csv tidak ditemukan: {args.csv}")
+    path = args.csv or write_catalog(args.rows, args.seed)
+    rows = len(SistemPakarLaptop(path).data)
+    if rows == 0:
+        print(f"Error: katalog {path} kosong atau gagal dimuat, benchmark dibatalkan.", file=sys.stderr)
+        sys.exit(1)
+
+    results = {}
+    if args.mode in ("load", "all"):
+        results.update(bench_load(path, args.repeat or 3))
+    if args.mode in ("query", "all"):
+        results.update(bench_query(SistemPakarLaptop(path, shared=args.shared), args.repeat or 20, args.filter))
+    if args.mode in ("http", "all"):
+        results.update(bench_http(path, args.clients, args.requests, args.seed))
+    if args.mode in ("memory", "all"):
+        results.update(bench_memory(path, args.repeat or 3))
+
+    hasil = {"rows": rows, "seed": args.seed, "csv": args.csv, "results": results,
+             "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    report(hasil)
+
+    for target in (args.output, args.save_baseline):
+        if target:
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(hasil, f, indent=2)
+    if any(s.get("parity_errors") for s in results.values()): sys.exit(1)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("rows") != hasil["rows"]:
+            print(f"Peringatan: baseline diukur dengan {baseline.get('rows')} baris, sekarang {hasil['rows']}.")
+        regresi = compare(hasil, baseline, args.tolerance)
+        for nama, lama, baru in regresi:
+            print(f"REGRESI {nama}: p50 {lama * 1000:.2f} ms -> {baru * 1000:.2f} ms")
+        if regresi: sys.exit(1)
+        print("Tidak ada regresi dibanding baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+def _ukuran(value):
+    # Perkiraan ukuran entry: pakai nbytes untuk array NumPy, sys.getsizeof untuk lainnya
+    if isinstance(value, (tuple, list)):
+        return sum(_ukuran(v) for v in value)
+    nbytes = getattr(value, 'nbytes', None)
+    return nbytes if nbytes is not None else sys.getsizeof(value)
+
+
+class LRUCache:
+    """Cache LRU thread-safe dengan batas jumlah entry dan total ukuran (bytes)."""
+
+    def __init__(self, max_items=256, max_bytes=64 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = _ukuran(value)
+        if size > self.max_bytes: return value  # terlalu besar untuk disimpan
+        with self._lock:
+            lama = self._data.pop(key, None)
+            if lama is not None: self.total_bytes -= lama[1]
+            self._data[key] = (value, size)
+            self.total_bytes += size
+            while len(self._data) > self.max_items or self.total_bytes > self.max_bytes:
+                _, (_, s) = self._data.popitem(last=False)
+                self.total_bytes -= s
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "items": len(self._data),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        # Cek keberadaan tanpa mempengaruhi urutan LRU maupun hit/miss
+        return key in self._data
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Menggabungkan panggilan identik yang sedang berjalan: satu thread menghitung, sisanya menunggu hasilnya."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None: raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
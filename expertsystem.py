@@ -2,10 +2,31 @@ import pandas as pd
 import numpy as np
 import re
 import math
+import time
+
+import metrics
+import snapshot
+from cache import LRUCache
+from katalog import KatalogIndex, PrefixMaks
+from ranking import RankingCursor
+from shared_katalog import SharedKatalog
 
 class SistemPakarLaptop:
-    def __init__(self, file_path):
+    # Naikkan jika hasil cleaning CSV berubah (mis. parsing harga) agar snapshot lama dibangun ulang
+    LOADER_VERSION = 2
+    # Kolom yang dipakai rekomendasi, index, dan output; mode compact membuang kolom CSV lainnya
+    KOLOM_COMPACT = ['Nama_Produk', 'Harga', 'CpuScore', 'GpuScore', 'RAM', 'Storage_GB', 'ScreenScore', 'RefreshRate',
+                     'TipeProcessor', 'TipeGPU', 'DetailLayar', 'LinkPenjelasan', 'LinkPembelian', 'Brand']
+
+    def __init__(self, file_path, use_snapshot=True, shared=False, compact=False):
         self.file_path = file_path
+        self.use_snapshot = use_snapshot or shared
+        # shared=True: katalog dibaca langsung dari mmap snapshot, dipakai bersama oleh semua worker
+        self.shared = shared
+        # compact=True: kolom diproyeksikan, string berulang jadi categorical, angka memakai dtype tersempit
+        # (shared sudah dictionary-encoded di mmap, jadi opsi ini hanya berlaku untuk mode DataFrame)
+        self.compact = compact and not shared
+        self._dtype_asli = {}
         self.KONVERSI_FACTOR = 166.9
         
         # Daftar Brand yang diminta
@@ -15,7 +36,10 @@ class SistemPakarLaptop:
             "Razer", "Intel", "Gainward", "Dynabook", "Google", "Zotac"
         ]
         
-        self.data = self._load_and_clean_data()
+        self._muat_katalog()
+
+        # Cache ranking per (rule, batas budget, brand, search, sort); halaman cukup slice dari sini
+        self.ranking_cache = LRUCache(max_items=512, max_bytes=64 * 1024 * 1024)
         
         # Rule Base
         self.rules = {
@@ -40,6 +64,7 @@ class SistemPakarLaptop:
                 "aaa_high": { "min_cpu": 30562, "min_gpu": 17399, "min_ram": 32, "min_screen": 120, "min_frame": 165, "w_cpu": 0.15, "w_gpu": 0.6, "w_ram": 0.1, "w_storage": 0.0, "w_screen": 0.1, "w_frame": 0.05, "desc": "AAA Games." }
             }
         }
+        self._siapkan_rule()
 
     def _load_and_clean_data(self):
         try:
@@ -56,34 +81,181 @@ class SistemPakarLaptop:
             for col in numeric_cols:
                 if col not in df.columns: df[col] = 0
                 if isinstance(df[col], pd.DataFrame): df[col] = df[col].iloc[:, 0]
-                if df[col].dtype == 'object': df[col] = df[col].astype(str).str.replace(r'[^\d.]', '', regex=True)
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+                df[col] = self._to_numeric(df[col])
 
             # Ekstraksi Refresh Rate
-            def extract_hz(text):
-                if not isinstance(text, str): return 60 
-                match = re.search(r'(\d+)\s*Hz', text, re.IGNORECASE)
-                return int(match.group(1)) if match else 60
-            
-            if 'DetailLayar' in df.columns: df['RefreshRate'] = df['DetailLayar'].apply(extract_hz)
+            if 'DetailLayar' in df.columns: df['RefreshRate'] = self._extract_hz(df['DetailLayar'])
             else: df['RefreshRate'] = 60
 
             # --- FITUR BARU: Identifikasi Brand ---
-            def identify_brand(product_name):
-                if not isinstance(product_name, str): return "Other"
-                name_upper = product_name.upper()
-                for brand in self.TARGET_BRANDS:
-                    if brand.upper() in name_upper:
-                        return brand
-                return "Other"
-
-            df['Brand'] = df['Nama_Produk'].apply(identify_brand)
+            df['Brand'] = self._identify_brand(df['Nama_Produk'])
             
             return df
         except Exception as e: 
             print(f"Error Loading: {e}")
             return pd.DataFrame()
 
+    @staticmethod
+    def _per_unik(col, fungsi, fill):
+        # Terapkan fungsi vektor hanya pada nilai unik (katalog penuh nilai berulang), lalu petakan balik
+        codes, uniques = pd.factorize(col)
+        hasil = fungsi(pd.Series(uniques, dtype=object)).to_numpy()
+        if (codes < 0).any():
+            hasil = np.append(hasil, fill)  # kode -1 (null) -> fill
+        return pd.Series(hasil[codes], index=col.index)
+
+    def _to_numeric(self, col):
+        # Kolom teks: buang karakter selain digit/titik (mis. "$1,299.99") lalu konversi, NaN -> 0
+        if pd.api.types.is_numeric_dtype(col):
+            return pd.to_numeric(col, errors='coerce').fillna(0)
+        bersih = lambda u: pd.to_numeric(u.astype(str).str.replace(r'[^\d.]', '', regex=True), errors='coerce')
+        return pd.to_numeric(self._per_unik(col, bersih, np.nan)).fillna(0)
+
+    HZ_PATTERN = re.compile(r'(\d+)\s*Hz', re.IGNORECASE)
+
+    def _extract_hz(self, col):
+        # Angka pertama sebelum "Hz" pada detail layar; default 60 jika tidak ada / bukan teks
+        def hz(u):
+            teks = u.where(u.map(type) == str)
+            angka = teks.str.extract(self.HZ_PATTERN, expand=False)
+            return angka.map(int, na_action='ignore').fillna(60).astype(np.int64)
+        return self._per_unik(col, hz, 60).astype(np.int64)
+
+    def _identify_brand(self, col):
+        # Loop brand lama, tapi cukup sekali per nama unik; prioritas tetap urutan TARGET_BRANDS
+        brands = [(b, b.upper()) for b in self.TARGET_BRANDS]
+        def brand(nama):
+            if not isinstance(nama, str): return "Other"
+            upper = nama.upper()
+            return next((b for b, bu in brands if bu in upper), "Other")
+        return self._per_unik(col, lambda u: u.map(brand), "Other")
+
+    def _build_index(self):
+        # Urutkan katalog sekali berdasarkan harga (stable) agar filter budget cukup berupa slice
+        if not self.data.empty:
+            self.data = self.data.sort_values(by='Harga', kind='stable').reset_index(drop=True)
+        return KatalogIndex.from_dataframe(self.data, self.TARGET_BRANDS)
+
+    def _compact(self, df):
+        # Proyeksi kolom + dtype sesempit mungkin tanpa mengubah satu nilai pun (dicek round-trip)
+        kolom = {}
+        self._dtype_asli = {}
+        for col in self.KOLOM_COMPACT:
+            if col not in df.columns: continue
+            x = df[col]
+            if pd.api.types.is_numeric_dtype(x.dtype):
+                self._dtype_asli[col] = x.dtype  # dikembalikan saat materialisasi agar output identik
+                kolom[col] = self._angka_sempit(x.to_numpy())
+            elif x.nunique(dropna=True) <= len(x) // 2:
+                kolom[col] = x.astype('category')  # nilai berulang (brand, CPU, GPU, layar)
+            else:
+                kolom[col] = x.astype(object)  # hampir unik per baris (nama, link): categorical tidak menghemat
+        return pd.DataFrame(kolom)
+
+    @staticmethod
+    def _angka_sempit(nilai):
+        if len(nilai) == 0: return nilai
+        if np.isfinite(nilai).all() and (nilai == np.round(nilai)).all():
+            lo, hi = nilai.min(), nilai.max()
+            for dtype in (np.uint8, np.uint16, np.uint32) if lo >= 0 else (np.int8, np.int16, np.int32):
+                info = np.iinfo(dtype)
+                if info.min <= lo and hi <= info.max: return nilai.astype(dtype)
+        if nilai.dtype == np.float64:
+            with np.errstate(over='ignore'):
+                f32 = nilai.astype(np.float32)
+            if np.array_equal(f32.astype(np.float64), nilai, equal_nan=True): return f32
+        return nilai
+
+    def memory_report(self):
+        # Pemakaian memori per kolom katalog + array index (MB)
+        baris = [(col, str(self.data[col].dtype), self.data[col].memory_usage(deep=True, index=False))
+                 for col in self.data.columns] if isinstance(self.data, pd.DataFrame) else []
+        baris += [(f"index.{nama}", str(arr.dtype), arr.nbytes) for nama, arr in self.index.arrays().items()]
+        baris.append(("rule.bitmap", "uint8", sum(b.nbytes for b in self.rule_bits.values())))
+        baris.append(("rule.prefix_maks", "float64", sum(p.nbytes for p in list(self._prefix_maks.values()))))
+        report = pd.DataFrame(baris, columns=['kolom', 'dtype', 'bytes'])
+        report['MB'] = report['bytes'] / 2 ** 20
+        return report
+
+    def snapshot_key(self):
+        # Snapshot valid selama isi CSV, versi loader, dan daftar brand (mempengaruhi kolom Brand) tidak berubah
+        return snapshot.content_hash(self.file_path, extra=f"loader{self.LOADER_VERSION}|" + ",".join(self.TARGET_BRANDS))
+
+    def _muat_katalog(self):
+        # Pakai snapshot biner jika cocok dengan CSV, jika tidak parse ulang lalu simpan snapshot baru
+        key = None
+        if self.use_snapshot:
+            try: key = self.snapshot_key()
+            except OSError: key = None
+        # Identitas versi data (dipakai mis. untuk ETag); unik per load jika tanpa snapshot
+        self.versi = key or f"mem-{time.time_ns()}"
+
+        if key and self.shared:
+            with metrics.span("load_snapshot"): katalog = SharedKatalog.open(self.file_path, key)
+            if katalog is None:
+                with snapshot.build_lock(self.file_path):
+                    # Proses lain mungkin sudah membangun snapshot ini selama kita menunggu kunci
+                    katalog = SharedKatalog.open(self.file_path, key)
+                    if katalog is None and self._parse_dan_simpan(key):
+                        katalog = SharedKatalog.open(self.file_path, key)
+            if katalog is not None:
+                self.data = katalog
+                self.index = KatalogIndex.from_arrays(katalog.arrays, self.TARGET_BRANDS)
+            return
+
+        with metrics.span("load_snapshot"):
+            opsi = {"kolom": self.KOLOM_COMPACT, "kategori": True} if self.compact else {}
+            hasil = snapshot.load_snapshot(self.file_path, key, **opsi) if key else None
+        if hasil is None and key:
+            with snapshot.build_lock(self.file_path):
+                # Proses lain mungkin sudah membangun snapshot ini selama kita menunggu kunci
+                hasil = snapshot.load_snapshot(self.file_path, key, **opsi)
+                if hasil is None: self._parse_dan_simpan(key)
+        elif hasil is None:
+            self._parse_dan_simpan(key)
+        if hasil is not None:
+            self.data, arrays = hasil
+            self.index = KatalogIndex.from_arrays(arrays, self.TARGET_BRANDS)
+        # Snapshot selalu menyimpan data lengkap; pemadatan hanya di memori proses ini
+        if self.compact and not self.data.empty: self.data = self._compact(self.data)
+
+    def _parse_dan_simpan(self, key):
+        with metrics.span("load_clean"): self.data = self._load_and_clean_data()
+        with metrics.span("build_index"): self.index = self._build_index()
+        if not key or self.data.empty: return False
+        try:
+            snapshot.save_snapshot(self.data, self.file_path, key, self.index.arrays())
+            return True
+        except OSError as e:
+            print(f"Gagal menyimpan snapshot: {e}")
+            return False
+
+    def _siapkan_rule(self):
+        # Threshold rule tetap, jadi baris yang lolos tiap (kategori, sub) cukup dihitung sekali per katalog:
+        # disimpan sebagai bitmap packed (1 bit per laptop, urutan harga)
+        rule_keys = [(k, s) for k, subs in self.rules.items() if k != "SHOW_ALL" for s in subs]
+        lolos = self._rule_masks([self.rules[k][s] for k, s in rule_keys])
+        self.rule_bits = dict(zip(rule_keys, np.packbits(lolos, axis=1)))
+        # Maksimum normalisasi SAW per (rule, kode brand) untuk batas budget apa pun; brand diisi saat dipakai
+        self._prefix_maks = {}
+        for k, s in rule_keys + [("SHOW_ALL", "all")]: self._maks_rule(k, s, None)
+
+    def _lolos_rule(self, kategori, sub_kategori, batas):
+        # Mask rule untuk prefix [:batas] dari bitmap
+        return np.unpackbits(self.rule_bits[(kategori, sub_kategori)], count=batas).view(bool)
+
+    def _maks_rule(self, kategori, sub_kategori, brand_kode):
+        kunci = (kategori, sub_kategori, brand_kode)
+        prefix = self._prefix_maks.get(kunci)
+        if prefix is None:
+            idx = self.index
+            mask = self._lolos_rule(kategori, sub_kategori, idx.n) if kategori != "SHOW_ALL" else None
+            if brand_kode is not None:
+                cocok = idx.brand_kode == brand_kode
+                mask = cocok if mask is None else mask & cocok
+            prefix = self._prefix_maks[kunci] = PrefixMaks(idx.fitur, None if mask is None else np.flatnonzero(mask))
+        return prefix
+
     def _reality_check(self, budget_idr, kategori, sub_kategori):
         if kategori == "SHOW_ALL": return True, "Valid" # Show all bypass
         
@@ -119,89 +291,133 @@ class SistemPakarLaptop:
         details = ", ".join(reasons)
         return f"Est: Rp {est_rupiah:,.0f} | {details}, Overall Score: {final_score:.3f}"
 
-    def rekomendasi(self, user_budget_idr, user_kategori, user_sub_kategori, 
-                    search_query=None, brand_filter=None, sort_option="score", page=1, per_page=20):
-        
-        empty_result = {"data": [], "total_pages": 0, "current_page": 1, "total_items": 0}
+    def _generate_explanation_batch(self, candidates, rule, kategori):
+        # Versi kolumnar dari _generate_explanation: string identik, tanpa apply per baris
+        if candidates.empty: return []
+
+        def as_int_str(col):
+            return candidates[col].to_numpy(dtype=np.float64).astype(np.int64).astype(str)
+
+        est = [f"Est: Rp {v:,.0f}" for v in (candidates['Harga'].to_numpy(dtype=np.float64) * self.KONVERSI_FACTOR).tolist()]
+        cpu, gpu, ram = as_int_str('CpuScore'), as_int_str('GpuScore'), as_int_str('RAM')
+
+        if kategori == "SHOW_ALL":
+            return [f"{e} | CPU {c}, GPU {g}, RAM {r}GB" for e, c, g, r in zip(est, cpu, gpu, ram)]
 
+        kosong = np.full(len(candidates), '', dtype=object)
+        kolom = [np.char.add(np.char.add('CPU ', cpu), f" (min:{rule['min_cpu']})")]
+
+        gpu_suffix = f" (min:{rule['min_gpu']})" if rule['min_gpu'] > 0 else ''
+        tampil_gpu = (rule['w_gpu'] > 0) | (candidates['GpuScore'].to_numpy() > 2000)
+        kolom.append(np.where(tampil_gpu, np.char.add(np.char.add('GPU ', gpu), gpu_suffix), kosong))
+
+        kolom.append(np.char.add(np.char.add('RAM ', ram), 'GB'))
+
+        if rule['w_screen'] > 0: kolom.append(np.char.add('Scrn ', as_int_str('ScreenScore')))
+        if rule['w_frame'] > 0:
+            refresh = candidates['RefreshRate'].to_numpy()
+            kolom.append(np.where(refresh > 60, np.char.add(as_int_str('RefreshRate'), 'Hz'), kosong))
+
+        skor = [f"{v:.3f}" for v in candidates['Nilai_Rekomendasi'].tolist()]
+        details = [", ".join(p for p in parts if p) for parts in zip(*kolom)]
+        return [f"{e} | {d}, Overall Score: {sk}" for e, d, sk in zip(est, details, skor)]
+
+    def _siapkan_query(self, user_budget_idr, user_kategori, user_sub_kategori,
+                       search_query=None, brand_filter=None, sort_option="score"):
+        # Normalisasi parameter menjadi (key cache, rule); None jika kategori tidak valid
         if self.data.empty or user_kategori not in self.rules:
-            return empty_result
+            return None
 
         # Handle Sub Kategori untuk SHOW_ALL
         if user_kategori == "SHOW_ALL":
             user_sub_kategori = "all"
         
         if user_sub_kategori not in self.rules[user_kategori]:
-            return empty_result
+            return None
 
         rule = self.rules[user_kategori][user_sub_kategori]
         
-        # 1. Validasi Budget
+        # 1. Validasi Budget (baris terurut harga -> cukup ambil prefix [:batas])
         budget_limit_usd = (user_budget_idr / self.KONVERSI_FACTOR) * 1.1 
-        candidates = self.data[self.data['Harga'] <= budget_limit_usd].copy()
-        
-        # 2. Filter Search Name (Jika ada)
-        if search_query:
-            candidates = candidates[candidates['Nama_Produk'].str.contains(search_query, case=False, na=False)]
+        batas = self.index.batas_budget(budget_limit_usd)
 
-        # 3. Filter Brand (Jika ada)
-        if brand_filter and brand_filter != "ALL":
-            candidates = candidates[candidates['Brand'] == brand_filter]
+        # Budget berbeda dengan batas yang sama menghasilkan ranking yang sama persis
+        brand_key = brand_filter if brand_filter and brand_filter != "ALL" else "ALL"
+        sort_key = sort_option if sort_option in ("lowest_price", "highest_price", "best_value") else "score"
+        return (user_kategori, user_sub_kategori, batas, brand_key, search_query or None, sort_key), rule
 
-        if candidates.empty: return empty_result
+    def rekomendasi(self, user_budget_idr, user_kategori, user_sub_kategori, 
+                    search_query=None, brand_filter=None, sort_option="score", page=1, per_page=20):
+        with metrics.span("rekomendasi"):
+            with metrics.span("budget_filter"):
+                query = self._siapkan_query(user_budget_idr, user_kategori, user_sub_kategori,
+                                            search_query, brand_filter, sort_option)
+            if query is None: return self._empty_result()
 
-        # 4. Filtering Spek (Hanya jika bukan SHOW_ALL)
-        if user_kategori != "SHOW_ALL":
-            candidates = candidates[
-                (candidates['CpuScore'] >= rule['min_cpu']) &
-                (candidates['GpuScore'] >= rule['min_gpu']) &
-                (candidates['RAM'] >= rule['min_ram']) &
-                (candidates['ScreenScore'] >= rule['min_screen']) &
-                (candidates['RefreshRate'] >= rule['min_frame'])
-            ]
-        
-        if candidates.empty: return empty_result
-
-        # 5. Scoring
-        max_cpu = candidates['CpuScore'].max() or 1
-        max_gpu = candidates['GpuScore'].max() or 1
-        max_ram = candidates['RAM'].max() or 1
-        max_storage = candidates['Storage_GB'].max() or 1
-        max_screen = candidates['ScreenScore'].max() or 1
-        max_frame = candidates['RefreshRate'].max() or 1
-        
-        candidates['Nilai_Rekomendasi'] = (
-            ((candidates['CpuScore'] / max_cpu) * rule['w_cpu']) +
-            ((candidates['GpuScore'] / max_gpu) * rule['w_gpu']) +
-            ((candidates['RAM'] / max_ram) * rule['w_ram']) +
-            ((candidates['Storage_GB'] / max_storage) * rule['w_storage']) +
-            ((candidates['ScreenScore'] / max_screen) * rule['w_screen']) +
-            ((candidates['RefreshRate'] / max_frame) * rule['w_frame'])
-        )
-        
-        candidates['Estimasi_Rupiah'] = candidates['Harga'] * self.KONVERSI_FACTOR
-
-        # --- SORTING ---
-        if sort_option == "lowest_price":
-            candidates = candidates.sort_values(by='Estimasi_Rupiah', ascending=True)
-        elif sort_option == "highest_price":
-            candidates = candidates.sort_values(by='Estimasi_Rupiah', ascending=False)
-        elif sort_option == "best_value":
-            candidates['Value_Factor'] = candidates['Nilai_Rekomendasi'] / candidates['Estimasi_Rupiah']
-            candidates = candidates.sort_values(by='Value_Factor', ascending=False)
-        else:
-            candidates = candidates.sort_values(by='Nilai_Rekomendasi', ascending=False)
-
-        # Generate Penjelasan
-        candidates['Penjelasan_AI'] = candidates.apply(
-            lambda row: self._generate_explanation(row, rule, user_kategori), axis=1
-        )
+            key, rule = query
+            metrics.kandidat("budget", key[2])
+            ranking = self.ranking_cache.get(key)
+            if ranking is None:
+                ranking = self.ranking_cache.put(key, self._ranking(key, rule))
+            return self._halaman(ranking, rule, key[0], page, per_page)
 
-        cols_output = ['Nama_Produk', 'Estimasi_Rupiah', 'TipeProcessor', 'TipeGPU', 'RAM', 'Storage_GB', 'DetailLayar', 'RefreshRate', 'Penjelasan_AI', 'LinkPenjelasan', 'LinkPembelian']
-        final_df = candidates[cols_output]
+    def rekomendasi_batch(self, queries):
+        # Banyak query sekaligus (list kwargs rekomendasi); hasil identik dengan rekomendasi per query
+        with metrics.span("rekomendasi_batch"): return self._rekomendasi_batch(queries)
+
+    def _rekomendasi_batch(self, queries):
+        siap = []
+        for q in queries:
+            q = dict(q)
+            page, per_page = q.pop('page', 1), q.pop('per_page', 20)
+            siap.append((self._siapkan_query(**q), page, per_page))
+
+        # Hanya query yang belum ada di cache yang perlu dihitung
+        baru = {query[0]: query[1] for query, _, _ in siap if query is not None and query[0] not in self.ranking_cache}
+
+        # Mask search dihitung sekali untuk seluruh katalog lalu di-slice per budget
+        cari = {key[4]: self._search_mask(key[4], self.index.n) for key in baru if key[4]}
+
+        # Kandidat + nilai SAW dipakai bersama oleh query yang hanya beda sort/halaman
+        skor = {}
+        for key, rule in baru.items():
+            basis = key[:5]
+            if basis not in skor:
+                skor[basis] = self._kandidat_skor(key, rule, cari.get(key[4]))
+            self.ranking_cache.put(key, self._cursor(*skor[basis], key[5]))
+
+        hasil = []
+        for query, page, per_page in siap:
+            if query is None:
+                hasil.append(self._empty_result())
+                continue
+            key, rule = query
+            ranking = self.ranking_cache.get(key)
+            if ranking is None:  # sudah tergusur LRU di tengah batch
+                ranking = self.ranking_cache.put(key, self._ranking(key, rule))
+            hasil.append(self._halaman(ranking, rule, key[0], page, per_page))
+        return hasil
+
+    def _rule_masks(self, rules):
+        # Matriks boolean (rule x laptop) untuk seluruh katalog dalam satu operasi broadcast
+        k = self.index.kolom
+        kolom = [k['CpuScore'], k['GpuScore'], k['RAM'], k['ScreenScore'], k['RefreshRate']]
+        batas = np.array([[r['min_cpu'], r['min_gpu'], r['min_ram'], r['min_screen'], r['min_frame']] for r in rules],
+                         dtype=np.float64).reshape(len(rules), len(kolom))
+        lolos = np.ones((len(rules), self.index.n), dtype=bool)
+        for j, x in enumerate(kolom):
+            lolos &= x[None, :] >= batas[:, j, None]
+        return lolos
+
+    @staticmethod
+    def _empty_result():
+        return {"data": [], "total_pages": 0, "current_page": 1, "total_items": 0}
+
+    def _halaman(self, ranking, rule, kategori, page, per_page):
+        if len(ranking) == 0: return self._empty_result()
 
         # --- PAGINATION ---
-        total_items = len(final_df)
+        total_items = len(ranking)
         total_pages = math.ceil(total_items / per_page)
         
         if page < 1: page = 1
@@ -209,15 +425,131 @@ class SistemPakarLaptop:
         
         start_idx = (page - 1) * per_page
         end_idx = start_idx + per_page
-        
-        page_data = final_df.iloc[start_idx:end_idx]
+
+        # Top-K: hanya peringkat sampai halaman ini yang diurutkan, lalu baris halaman dimaterialisasi
+        with metrics.span("sort"): urut = ranking.ambil(start_idx, end_idx)
+        page_data = self._materialize(ranking.posisi[urut], ranking.nilai[urut], rule, kategori)
+        with metrics.span("to_dict"): data = page_data.to_dict('records')
 
         return {
-            "data": page_data.to_dict('records'),
+            "data": data,
             "total_pages": total_pages,
             "current_page": page,
             "total_items": total_items
         }
 
+    def _ranking(self, key, rule):
+        # Menghasilkan RankingCursor atas seluruh kandidat; pengurutan dilakukan bertahap per halaman
+        return self._cursor(*self._kandidat_skor(key, rule), key[5])
+
+    def _kandidat_skor(self, key, rule, cari=None):
+        # (posisi kandidat terurut harga, nilai SAW); cari = mask search seluruh katalog yang sudah dihitung
+        kategori, sub_kategori, batas, brand_filter, search_query, _ = key
+        idx = self.index
+        mask = None
+        
+        # 2. Filter Search Name (Jika ada)
+        if search_query:
+            with metrics.span("search"):
+                mask = cari[:batas] if cari is not None else self._search_mask(search_query, batas)
+            metrics.kandidat("search", mask)
+
+        # 3. Filter Brand (Jika ada)
+        if brand_filter != "ALL":
+            with metrics.span("brand_filter"):
+                cocok = idx.brand_kode[:batas] == idx.kode_brand(brand_filter)
+                mask = cocok if mask is None else mask & cocok
+            metrics.kandidat("brand", mask)
+
+        # 4. Filtering Spek (Hanya jika bukan SHOW_ALL)
+        if kategori != "SHOW_ALL":
+            with metrics.span("rule_filter"):
+                lolos = self._lolos_rule(kategori, sub_kategori, batas)
+                mask = lolos if mask is None else mask & lolos
+            metrics.kandidat("rule", mask)
+
+        # 5. Scoring (dihitung float64 agar nilai identik dengan perhitungan pandas)
+        with metrics.span("scoring"):
+            if mask is None:
+                posisi = np.arange(batas)
+                fitur = idx.fitur[:, :batas]
+            else:
+                posisi = np.flatnonzero(mask)
+                fitur = idx.fitur[:, posisi]
+
+            if len(posisi) == 0: return posisi, np.empty(0)
+
+            fitur = fitur.astype(np.float64)
+            if search_query:
+                maks = fitur.max(axis=1)
+            else:
+                # Tanpa search, kandidat = rule (+brand) di bawah batas budget: maksimum cukup lookup prefix
+                brand_kode = idx.kode_brand(brand_filter) if brand_filter != "ALL" else None
+                maks = self._maks_rule(kategori, sub_kategori, brand_kode).maks(batas)
+            maks[maks == 0] = 1
+            cpu, gpu, ram, storage, screen, frame = fitur
+            max_cpu, max_gpu, max_ram, max_storage, max_screen, max_frame = maks
+
+            nilai = (
+                ((cpu / max_cpu) * rule['w_cpu']) +
+                ((gpu / max_gpu) * rule['w_gpu']) +
+                ((ram / max_ram) * rule['w_ram']) +
+                ((storage / max_storage) * rule['w_storage']) +
+                ((screen / max_screen) * rule['w_screen']) +
+                ((frame / max_frame) * rule['w_frame'])
+            )
+        return posisi, nilai
+
+    def _cursor(self, posisi, nilai, sort_option):
+        idx = self.index
+        # --- SORTING --- (stable: nilai sama -> lebih murah dulu, lalu urutan file)
+        # Kunci diurutkan naik, jadi urutan menurun memakai kunci negatif
+        with metrics.span("sort_key"):
+            if sort_option == "lowest_price":
+                kunci = None  # posisi sudah terurut harga
+            else:
+                estimasi = idx.harga[posisi] * self.KONVERSI_FACTOR
+                if sort_option == "highest_price":
+                    kunci = -estimasi
+                elif sort_option == "best_value":
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        value_factor = nilai / estimasi
+                    kunci = -value_factor
+                else:
+                    kunci = -nilai
+
+        return RankingCursor(posisi, nilai, kunci)
+
+    def _search_mask(self, search_query, batas):
+        # Pencarian substring literal (case-insensitive) lewat inverted index, bukan regex scan
+        q = search_query.lower()
+        nama = self.data['Nama_Produk']
+        kandidat, verifikasi = self.index.nama.kandidat(search_query)
+        if kandidat is None:
+            teks = nama.iloc[:batas]
+            return teks.str.lower().str.contains(q, regex=False, na=False).to_numpy(dtype=bool)
+
+        kandidat = kandidat[:np.searchsorted(kandidat, batas)]
+        if verifikasi and len(kandidat):
+            teks = nama.iloc[kandidat]
+            kandidat = kandidat[teks.str.lower().str.contains(q, regex=False, na=False).to_numpy(dtype=bool)]
+        mask = np.zeros(batas, dtype=bool)
+        mask[kandidat] = True
+        return mask
+
+    def _materialize(self, baris, nilai, rule, kategori):
+        with metrics.span("materialize"):
+            candidates = self.data.take(baris)
+            if self._dtype_asli: candidates = candidates.astype(self._dtype_asli)
+            candidates['Nilai_Rekomendasi'] = nilai
+            candidates['Estimasi_Rupiah'] = candidates['Harga'] * self.KONVERSI_FACTOR
+
+        # Generate Penjelasan (hanya untuk baris di halaman ini)
+        with metrics.span("explanation"):
+            candidates['Penjelasan_AI'] = self._generate_explanation_batch(candidates, rule, kategori)
+
+        cols_output = ['Nama_Produk', 'Estimasi_Rupiah', 'TipeProcessor', 'TipeGPU', 'RAM', 'Storage_GB', 'DetailLayar', 'RefreshRate', 'Penjelasan_AI', 'LinkPenjelasan', 'LinkPembelian']
+        return candidates[cols_output]
+
     def get_brands(self):
         return self.TARGET_BRANDS
\ No newline at end of file
@@ -0,0 +1,9 @@
+import multiprocessing
+
+# Jalankan dengan: gunicorn app:app
+# app.py di-import sekali oleh master sebelum fork, sehingga snapshot katalog dibangun/dipetakan
+# sekali saja dan semua worker berbagi halaman memori mmap yang sama (tanpa reload per worker).
+preload_app = True
+
+bind = "0.0.0.0:8000"
+workers = multiprocessing.cpu_count() * 2 + 1
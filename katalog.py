@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+
+# Kolom fitur yang dipakai untuk filter rule & scoring SAW (urutan = baris matriks)
+FITUR = ['CpuScore', 'GpuScore', 'RAM', 'Storage_GB', 'ScreenScore', 'RefreshRate']
+
+
+class KatalogIndex:
+    """Index kolumnar read-only atas katalog yang sudah diurutkan berdasarkan harga."""
+
+    def __init__(self, harga, fitur, brand_kode, brands, nama):
+        # Array bisa berupa milik sendiri atau mmap dari snapshot (dipakai bersama antar worker)
+        self.n = len(harga)
+        # Harga tetap float64 agar batas budget & Estimasi_Rupiah identik dengan DataFrame
+        self.harga = self._read_only(harga)
+        # Matriks fitur (fitur x laptop): tiap baris contiguous, jadi slice budget = view
+        self.fitur = self._read_only(fitur)
+        self.kolom = {col: self.fitur[i] for i, col in enumerate(FITUR)}
+        # Brand disimpan sebagai kode integer (index ke daftar brand, -1 = Other)
+        self.brand_kode = self._read_only(brand_kode)
+        self.brands = list(brands)
+        # Inverted index Nama_Produk untuk filter search_query
+        self.nama = nama
+
+    @classmethod
+    def from_dataframe(cls, df, brands):
+        fitur = np.empty((len(FITUR), len(df)), dtype=np.float64)
+        for i, col in enumerate(FITUR):
+            fitur[i] = cls._kolom(df, col, np.float64)
+        # float32 hanya jika semua nilai lolos round-trip; jika tidak, filter rule & ranking bisa berbeda
+        with np.errstate(over='ignore'):
+            f32 = fitur.astype(np.float32)
+        if np.array_equal(f32.astype(np.float64), fitur, equal_nan=True): fitur = f32
+
+        kode_brand = {b: i for i, b in enumerate(brands)}
+        if 'Brand' in df.columns:
+            brand_kode = df['Brand'].map(kode_brand).fillna(-1).to_numpy(dtype=np.int16)
+        else:
+            brand_kode = np.full(len(df), -1, dtype=np.int16)
+        names = df['Nama_Produk'] if 'Nama_Produk' in df.columns else [None] * len(df)
+        return cls(cls._kolom(df, 'Harga', np.float64), fitur, brand_kode, brands, IndeksNama.from_names(names))
+
+    @classmethod
+    def from_arrays(cls, arrays, brands):
+        return cls(arrays['harga'], arrays['fitur'], arrays['brand_kode'], brands, IndeksNama.from_arrays(arrays))
+
+    def arrays(self):
+        return {"harga": self.harga, "fitur": self.fitur, "brand_kode": self.brand_kode, **self.nama.arrays()}
+
+    @staticmethod
+    def _kolom(df, col, dtype):
+        if col not in df.columns: return np.zeros(len(df), dtype=dtype)
+        return np.array(df[col].to_numpy(dtype=dtype), dtype=dtype)  # salinan milik index sendiri
+
+    @staticmethod
+    def _read_only(arr):
+        if arr.flags.writeable: arr.flags.writeable = False
+        return arr
+
+    def batas_budget(self, budget_limit_usd):
+        # Jumlah baris dengan Harga <= budget (baris terurut harga, jadi cukup binary search)
+        return int(np.searchsorted(self.harga, budget_limit_usd, side='right'))
+
+    def kode_brand(self, brand):
+        if brand == "Other": return -1
+        try: return self.brands.index(brand)
+        except ValueError: return -2  # brand tidak dikenal: tidak cocok dengan baris manapun
+
+
+class PrefixMaks:
+    """Maksimum berjalan tiap fitur atas baris terpilih (terurut harga); hanya titik rekor yang disimpan."""
+
+    def __init__(self, fitur, posisi=None):
+        # fitur: matriks (fitur x laptop); posisi: baris terpilih (naik), None = semua baris
+        self.titik, self.nilai = [], []
+        for x in fitur:
+            if posisi is not None: x = x[posisi]
+            if len(x):
+                jalan = np.maximum.accumulate(x)
+                rekor = np.flatnonzero(np.r_[True, jalan[1:] > jalan[:-1]])
+            else:
+                rekor = np.empty(0, dtype=np.int64)
+            self.titik.append(rekor if posisi is None else posisi[rekor])
+            self.nilai.append(x[rekor].astype(np.float64))
+
+    def maks(self, batas):
+        # Maksimum tiap fitur atas baris terpilih dengan posisi < batas (0 jika tidak ada)
+        hasil = np.zeros(len(self.titik))
+        for j, (titik, nilai) in enumerate(zip(self.titik, self.nilai)):
+            i = np.searchsorted(titik, batas) - 1
+            if i >= 0: hasil[j] = nilai[i]
+        return hasil
+
+    @property
+    def nbytes(self):
+        return sum(t.nbytes + v.nbytes for t, v in zip(self.titik, self.nilai))
+
+
+def _gram_keys(kode, n):
+    # Pack n code point berurutan (masing-masing <= 21 bit) menjadi satu kunci int64
+    if len(kode) < n: return np.empty(0, dtype=np.int64)
+    keys = kode[:len(kode) - n + 1].astype(np.int64)
+    for j in range(1, n):
+        keys = (keys << 21) | kode[j:len(kode) - n + 1 + j]
+    return keys
+
+
+def _postings(keys, rows):
+    # Inverted index format CSR: kunci unik terurut, offset, dan daftar baris (naik) per kunci
+    if len(keys) and keys.max() < 2 ** 31:
+        # Kunci kecil: pack (kunci, baris) jadi satu int64 sehingga cukup satu sort + dedupe
+        packed = np.sort((keys.astype(np.int64) << 32) | rows.astype(np.int64))
+        packed = packed[np.r_[True, packed[1:] != packed[:-1]]] if len(packed) else packed
+        keys, rows = packed >> 32, packed & 0xFFFFFFFF
+    else:
+        urut = np.lexsort((rows, keys))
+        keys, rows = keys[urut], rows[urut]
+        unik = np.ones(len(keys), dtype=bool)
+        unik[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys, rows = keys[unik], rows[unik]
+    awal = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+    return keys[awal], np.append(awal, len(keys)).astype(np.int64), rows.astype(np.int32)
+
+
+def _trigram_postings(kode, baris):
+    # Postings trigram dengan kunci 63-bit (code point di-pack); trigram yang melewati separator dibuang
+    if len(kode) < 3: return _postings(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    valid = (kode[:-2] != 0) & (kode[1:-1] != 0) & (kode[2:] != 0)
+    baris = baris[:-2][valid]
+
+    # Code point dipetakan ke alfabet padat (terurut) agar kunci muat 31 bit dan sort jauh lebih murah;
+    # pemetaan monoton, jadi urutan kunci sama persis dengan kunci 63-bit
+    ada = np.zeros(int(kode.max()) + 1, dtype=np.int64)
+    ada[kode] = 1
+    alpha = np.flatnonzero(ada)
+    a = len(alpha)
+    if a ** 3 >= 2 ** 31:
+        return _postings(_gram_keys(kode, 3)[valid], baris)
+
+    d = (np.cumsum(ada) - 1)[kode]
+    keys, offsets, rows = _postings(((d[:-2] * a + d[1:-1]) * a + d[2:])[valid], baris)
+    d0, sisa = np.divmod(keys, a * a)
+    d1, d2 = np.divmod(sisa, a)
+    return (alpha[d0] << 42) | (alpha[d1] << 21) | alpha[d2], offsets, rows
+
+
+class IndeksNama:
+    """Inverted index token + trigram atas Nama_Produk (lowercase) untuk pencarian substring literal."""
+
+    SEP = "\x00"
+
+    def __init__(self, tri_keys, tri_offsets, tri_rows, tok_blob, tok_offsets, tok_post_offsets, tok_rows):
+        self.tri_keys, self.tri_offsets, self.tri_rows = tri_keys, tri_offsets, tri_rows
+        self.tok_blob, self.tok_offsets = tok_blob, tok_offsets
+        self.tok_post_offsets, self.tok_rows = tok_post_offsets, tok_rows
+        self._vocab = None
+
+    @classmethod
+    def from_names(cls, names):
+        # Nilai bukan string (mis. kolom nama yang ter-parse sebagai angka) diperlakukan seperti null
+        names = pd.Series(names, dtype=object)
+        lower = names.where(names.map(type) == str).str.lower()
+
+        # Trigram: semua nama digabung dengan separator, dikodekan UTF-32 lalu di-pack secara vektor
+        teks = lower.fillna("").str.replace(cls.SEP, " ", regex=False).tolist()
+        kode = np.frombuffer(cls.SEP.join(teks).encode('utf-32-le'), dtype=np.uint32)
+        tri = _trigram_postings(kode, np.cumsum(kode == 0))
+
+        # Token (dipisah whitespace): kosakata disimpan sebagai blob UTF-8 agar bisa dicari substring-nya
+        token = lower.str.split().explode().dropna()
+        kode_tok, vocab = pd.factorize(token)
+        tok_keys, tok_post_offsets, tok_rows = _postings(kode_tok.astype(np.int64), token.index.to_numpy(dtype=np.int64))
+        vocab = [vocab[i].encode('utf-8') for i in tok_keys]
+        tok_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum([len(v) + 1 for v in vocab], out=tok_offsets[1:])
+        tok_blob = np.frombuffer(b"".join(v + b"\n" for v in vocab), dtype=np.uint8)
+        return cls(*tri, tok_blob, tok_offsets, tok_post_offsets, tok_rows)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(*(arrays[f"nama_{k}"] for k in cls._KOLOM))
+
+    _KOLOM = ("tri_keys", "tri_offsets", "tri_rows", "tok_blob", "tok_offsets", "tok_post_offsets", "tok_rows")
+
+    def arrays(self):
+        return {f"nama_{k}": getattr(self, k) for k in self._KOLOM}
+
+    def _posting_tri(self, key):
+        i = np.searchsorted(self.tri_keys, key)
+        if i == len(self.tri_keys) or self.tri_keys[i] != key: return None
+        return self.tri_rows[self.tri_offsets[i]:self.tri_offsets[i + 1]]
+
+    def kandidat(self, query):
+        # Superset baris (terurut naik) yang mungkin mengandung query, dan apakah masih perlu verifikasi literal
+        q = query.lower()
+        if len(q) >= 3:
+            kode = np.frombuffer(q.encode('utf-32-le'), dtype=np.uint32)
+            postings = []
+            for key in np.unique(_gram_keys(kode, 3)).tolist():
+                p = self._posting_tri(key)
+                if p is None: return np.empty(0, dtype=np.int32), False
+                postings.append(p)
+            postings.sort(key=len)
+            hasil = postings[0]
+            for p in postings[1:]:
+                hasil = np.intersect1d(hasil, p, assume_unique=True)
+            return hasil, len(q) > 3
+
+        if any(c.isspace() for c in q): return None, True  # bisa melewati batas token: scan biasa
+
+        # Query pendek tanpa spasi selalu berada di dalam satu token: cari di kosakata token
+        if self._vocab is None: self._vocab = self.tok_blob.tobytes()
+        blob = self._vocab
+        needle = q.encode('utf-8')
+        ids = set()
+        pos = blob.find(needle)
+        while pos != -1:
+            ids.add(int(np.searchsorted(self.tok_offsets, pos, side='right')) - 1)
+            pos = blob.find(needle, pos + 1)
+        if not ids: return np.empty(0, dtype=np.int32), False
+        rows = [self.tok_rows[self.tok_post_offsets[i]:self.tok_post_offsets[i + 1]] for i in sorted(ids)]
+        return np.unique(np.concatenate(rows)), False
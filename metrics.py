@@ -0,0 +1,206 @@
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+# LAPTOP_METRICS=0 mematikan semua instrumentasi (span/gauge jadi no-op)
+ENABLED = os.environ.get("LAPTOP_METRICS", "1") != "0"
+
+# Batas bucket histogram latency (detik), sama dengan default prometheus_client
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+_lokal = threading.local()
+
+
+class Histogram:
+    """Histogram Prometheus per kombinasi label (bucket kumulatif dihitung saat render)."""
+
+    def __init__(self, nama, bantuan, label, buckets=BUCKETS):
+        self.nama, self.bantuan, self.label, self.buckets = nama, bantuan, label, buckets
+        self._lock = threading.Lock()
+        self._data = {}  # label -> [count per bucket (+Inf terakhir), sum]
+
+    def observe(self, nilai, *label):
+        i = bisect.bisect_left(self.buckets, nilai)  # bucket pertama dengan le >= nilai
+        with self._lock:
+            entry = self._data.get(label)
+            if entry is None: entry = self._data[label] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][i] += 1
+            entry[1] += nilai
+
+    def render(self):
+        baris = [f"# HELP {self.nama} {self.bantuan}", f"# TYPE {self.nama} histogram"]
+        with self._lock:
+            data = sorted((k, list(v[0]), v[1]) for k, v in self._data.items())
+        for label, counts, total in data:
+            lbl = _format_label(self.label, label)
+            kumulatif = np.cumsum(counts)
+            for batas, n in zip(self.buckets + ("+Inf",), kumulatif):
+                baris.append(f'{self.nama}_bucket{{{lbl}{"," if lbl else ""}le="{batas}"}} {n}')
+            baris.append(f"{_seri(self.nama + '_sum', lbl)} {total}")
+            baris.append(f"{_seri(self.nama + '_count', lbl)} {kumulatif[-1]}")
+        return baris
+
+
+class Gauge:
+    """Gauge Prometheus: nilai terakhir per kombinasi label."""
+
+    def __init__(self, nama, bantuan, label):
+        self.nama, self.bantuan, self.label = nama, bantuan, label
+        self._data = {}
+
+    def set(self, nilai, *label):
+        self._data[label] = nilai
+
+    def render(self):
+        baris = [f"# HELP {self.nama} {self.bantuan}", f"# TYPE {self.nama} gauge"]
+        for label, nilai in sorted(self._data.items()):
+            baris.append(f"{_seri(self.nama, _format_label(self.label, label))} {nilai}")
+        return baris
+
+
+def _seri(nama, label):
+    return f"{nama}{{{label}}}" if label else nama
+
+
+def _format_label(nama, nilai):
+    escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{k}="{escape(v)}"' for k, v in zip(nama, nilai))
+
+
+REQUEST_SECONDS = Histogram("laptop_request_seconds", "Latency request rekomendasi end-to-end",
+                            ("endpoint", "kategori", "sub_kategori", "sort_option"))
+STAGE_SECONDS = Histogram("laptop_stage_seconds", "Durasi per tahap pipeline rekomendasi", ("stage",))
+KANDIDAT = Gauge("laptop_kandidat", "Jumlah kandidat setelah tiap filter (request terakhir)", ("stage",))
+
+
+class _Span:
+    __slots__ = ("nama", "mulai")
+
+    def __init__(self, nama):
+        self.nama = nama
+
+    def __enter__(self):
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        durasi = time.perf_counter() - self.mulai
+        STAGE_SECONDS.observe(durasi, self.nama)
+        trace = getattr(_lokal, "trace", None)
+        if trace is not None: trace[self.nama] = trace.get(self.nama, 0.0) + durasi
+        return False
+
+
+class _Noop:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+
+_NOOP = _Noop()
+
+
+def span(nama):
+    # Timing satu tahap: `with metrics.span("scoring"): ...`
+    return _Span(nama) if ENABLED else _NOOP
+
+
+def kandidat(stage, nilai):
+    # Gauge jumlah kandidat; nilai boleh int atau mask boolean (dihitung hanya jika metrics aktif)
+    if not ENABLED: return
+    KANDIDAT.set(nilai if isinstance(nilai, (int, np.integer)) else int(np.count_nonzero(nilai)), stage)
+
+
+class SamplingProfiler:
+    """Profiler sampling untuk request lambat: thread latar mencatat stack thread request tiap interval."""
+
+    def __init__(self, threshold, interval=0.005, keep=20):
+        self.threshold = threshold
+        self.interval = interval
+        self.profiles = deque(maxlen=keep)  # (label, durasi, durasi per tahap, stack teratas)
+        self._aktif = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        tid = threading.get_ident()
+        with self._lock:
+            self._aktif[tid] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="sampling-profiler", daemon=True)
+                self._thread.start()
+        return tid
+
+    def stop(self, tid, durasi, label, trace):
+        with self._lock:
+            sampel = self._aktif.pop(tid, None)
+        if sampel is None or durasi < self.threshold: return
+        teratas = sampel.most_common(5)
+        self.profiles.append((label, durasi, dict(trace), teratas))
+        tahap = ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in trace.items())
+        print(f"[profiler] request lambat {durasi * 1000:.0f}ms {label} | {tahap}")
+        for stack, n in teratas:
+            print(f"  {n:>4}x {stack}")
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                aktif = list(self._aktif.items())
+            if not aktif: continue
+            frames = sys._current_frames()
+            for tid, sampel in aktif:
+                frame = frames.get(tid)
+                if frame is not None: sampel[_stack(frame)] += 1
+
+
+def _stack(frame, depth=6):
+    # Stack ringkas "file:fungsi:baris" dari frame terdalam ke luar
+    bagian = []
+    while frame is not None and len(bagian) < depth:
+        kode = frame.f_code
+        bagian.append(f"{os.path.basename(kode.co_filename)}:{kode.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return " < ".join(bagian)
+
+
+# Opt-in: LAPTOP_PROFILE_SLOW_MS=500 -> request di atas 500ms dicetak beserta stack yang paling sering tersampel
+_slow_ms = os.environ.get("LAPTOP_PROFILE_SLOW_MS")
+profiler = SamplingProfiler(float(_slow_ms) / 1000) if ENABLED and _slow_ms else None
+
+
+class _Request:
+    __slots__ = ("label", "tid", "mulai")
+
+    def __init__(self, label):
+        self.label = label
+
+    def __enter__(self):
+        _lokal.trace = {}
+        self.tid = profiler.start() if profiler else None
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        durasi = time.perf_counter() - self.mulai
+        REQUEST_SECONDS.observe(durasi, *self.label)
+        trace, _lokal.trace = _lokal.trace, None
+        if profiler: profiler.stop(self.tid, durasi, self.label, trace)
+        return False
+
+
+def request(endpoint, kategori, sub_kategori, sort_option):
+    # Span satu request: histogram latency per label + profiler sampling (jika diaktifkan)
+    return _Request((endpoint, kategori, sub_kategori, sort_option)) if ENABLED else _NOOP
+
+
+def render(extra=()):
+    # Format teks Prometheus (per proses; tiap worker gunicorn di-scrape sendiri)
+    baris = []
+    for metrik in (REQUEST_SECONDS, STAGE_SECONDS, KANDIDAT, *extra):
+        baris.extend(metrik.render())
+    return "\n".join(baris) + "\n"
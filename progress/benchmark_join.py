@@ -0,0 +1,187 @@
+import argparse
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Kata yang tidak membedakan model (merek, kata umum) dibuang saat normalisasi,
+# sehingga "Intel(R) Core(TM) i7-13700H" dan "Core i7 13700H" menjadi kunci yang sama
+NOISE = {"intel", "amd", "nvidia", "apple", "qualcomm", "core", "geforce", "processor", "cpu", "gpu",
+         "graphics", "with", "r", "tm"}
+CLOCK = re.compile(r'@.*$|\d+(?:\.\d+)?\s*ghz')
+NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# Fuzzy match di bawah ambang ini dianggap tidak cocok
+MIN_CONFIDENCE = 0.5
+# Di bawah jumlah nama unik ini, process pool lebih mahal daripada manfaatnya
+MIN_PARALLEL = 2000
+
+
+def normalize(text):
+    if not isinstance(text, str): return ""
+    teks = CLOCK.sub(' ', text.lower().replace('®', ' ').replace('™', ' '))
+    return " ".join(t for t in NON_ALNUM.sub(' ', teks).split() if t not in NOISE)
+
+
+def model_tokens(norm):
+    # Token penentu model: campuran huruf+angka ("i7", "13700h", "680m") atau angka >= 3 digit ("4060")
+    return {t for t in norm.split() if any(c.isdigit() for c in t) and (not t.isdigit() or len(t) >= 3)}
+
+
+def trigrams(norm):
+    padded = f" {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class BenchmarkIndex:
+    """Index nama benchmark: hash kunci ternormalisasi untuk exact match, posting trigram untuk fuzzy."""
+
+    def __init__(self, names, scores):
+        self.names = list(names)
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.exact = {}
+        self.tokens = []
+        self.sizes = []
+        self.postings = {}
+        for i, name in enumerate(self.names):
+            norm = normalize(name)
+            self.exact.setdefault(norm, i)  # nama duplikat: sumber/urutan pertama menang
+            self.tokens.append(set(norm.split()))
+            grams = trigrams(norm)
+            self.sizes.append(len(grams))
+            for g in grams:
+                self.postings.setdefault(g, []).append(i)
+
+    def match(self, query):
+        # -> (index benchmark atau -1, confidence 0..1, metode)
+        norm = normalize(query)
+        if not norm: return -1, 0.0, "empty"
+        i = self.exact.get(norm)
+        if i is not None: return i, 1.0, "exact"
+
+        grams = trigrams(norm)
+        shared = Counter()
+        for g in grams:
+            shared.update(self.postings.get(g, ()))
+        if not shared: return -1, 0.0, "unmatched"
+
+        # Dice trigram, dikali cakupan token model (beda "13700h" vs "13700hx" harus turun tajam)
+        penting = model_tokens(norm)
+        best, best_conf = -1, 0.0
+        for i, c in shared.items():
+            conf = 2.0 * c / (len(grams) + self.sizes[i])
+            if penting: conf *= len(penting & self.tokens[i]) / len(penting)
+            if conf > best_conf or (conf == best_conf and best >= 0 and self.sizes[i] < self.sizes[best]):
+                best, best_conf = i, conf
+        if best_conf < MIN_CONFIDENCE: return -1, best_conf, "unmatched"
+        return best, best_conf, "fuzzy"
+
+    def match_many(self, queries):
+        return [self.match(q) for q in queries]
+
+
+def load_benchmarks(paths, name_col, score_col):
+    # Gabungkan beberapa CSV hasil scraper; skor "12,345" dibersihkan menjadi angka
+    frames = [pd.read_csv(p, usecols=[name_col, score_col], dtype=str) for p in paths]
+    df = pd.concat(frames, ignore_index=True).dropna(subset=[name_col])
+    scores = pd.to_numeric(df[score_col].str.replace(r'[^\d.]', '', regex=True), errors='coerce')
+    df = df[scores.notna()]
+    return BenchmarkIndex(df[name_col].tolist(), scores[scores.notna()].to_numpy())
+
+
+_INDEX = None
+
+
+def _init_worker(index):
+    global _INDEX
+    _INDEX = index
+
+
+def _match_chunk(queries):
+    return _INDEX.match_many(queries)
+
+
+def resolve(index, queries, workers=None):
+    # Cocokkan daftar nama unik, dibagi per potongan ke process pool jika cukup banyak
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(queries) < MIN_PARALLEL: return index.match_many(queries)
+    size = -(-len(queries) // (workers * 4))
+    chunks = [queries[i:i + size] for i in range(0, len(queries), size)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(index,)) as pool:
+        return [hasil for part in pool.map(_match_chunk, chunks) for hasil in part]
+
+
+def join_column(df, col, index, workers=None):
+    # Skor, nama benchmark, confidence, dan metode per baris katalog (dihitung sekali per nama unik)
+    codes, uniques = pd.factorize(df[col] if col in df.columns else pd.Series([np.nan] * len(df)))
+    hasil = resolve(index, [str(u) for u in uniques], workers)
+    idx = np.array([h[0] for h in hasil] + [-1], dtype=np.int64)
+    conf = np.array([h[1] for h in hasil] + [0.0])
+    metode = np.array([h[2] for h in hasil] + ["empty"], dtype=object)
+    names = np.array(index.names + [None], dtype=object)
+    scores = np.append(index.scores, np.nan)
+
+    per_unik = pd.DataFrame({"query": list(uniques), "matched": names[idx[:-1]], "score": scores[idx[:-1]],
+                             "confidence": conf[:-1], "method": metode[:-1],
+                             "rows": np.bincount(codes[codes >= 0], minlength=len(uniques))})
+    return scores[idx[codes]], conf[codes], metode[codes], per_unik
+
+
+def summarize(label, conf, metode, per_unik, top=10):
+    n = len(metode)
+    print(f"[{label}] {n} baris, {len(per_unik)} nama unik")
+    for m in ("exact", "fuzzy", "unmatched", "empty"):
+        jumlah = int((metode == m).sum())
+        print(f"  {m:<9} {jumlah:>8} ({jumlah / max(n, 1):.1%})")
+    fuzzy = conf[metode == "fuzzy"]
+    if len(fuzzy):
+        q = np.percentile(fuzzy, [5, 50, 95])
+        print(f"  confidence fuzzy p5={q[0]:.2f} p50={q[1]:.2f} p95={q[2]:.2f}")
+    gagal = per_unik[per_unik["method"] == "unmatched"].nlargest(top, "rows")
+    if len(gagal):
+        print("  Tidak dikenali (terbanyak):")
+        for _, r in gagal.iterrows():
+            print(f"    {r['rows']:>6}x  {r['query']}")
+
+
+def build_dataset(catalog, cpu_paths, gpu_paths, output, workers=None, report=None):
+    t = time.perf_counter()
+    df = pd.read_csv(catalog)
+    laporan = []
+    for label, col, target, paths, name_col, score_col in [
+        ("CPU", "Processor", "CPU_Score", cpu_paths, "CPU Name", "CPU Mark"),
+        ("GPU", "GPU", "GPU_Score", gpu_paths, "Videocard Name", "Passmark G3D Mark"),
+    ]:
+        index = load_benchmarks(paths, name_col, score_col)
+        scores, conf, metode, per_unik = join_column(df, col, index, workers)
+        # Nama yang tidak dikenali mempertahankan skor lama (jika ada), supaya bisa diisi manual
+        lama = pd.to_numeric(df[target], errors='coerce').to_numpy() if target in df.columns else np.full(len(df), np.nan)
+        df[target] = np.where(np.isnan(scores), lama, scores)
+        summarize(label, conf, metode, per_unik)
+        laporan.append(per_unik.assign(kind=label))
+
+    df.to_csv(output, index=False)
+    if report:
+        pd.concat(laporan, ignore_index=True).to_csv(report, index=False)
+    print(f"Disimpan ke {output} ({len(df)} baris) dalam {time.perf_counter() - t:.2f}s")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gabungkan skor benchmark CPU/GPU ke katalog laptop")
+    parser.add_argument("catalog", help="CSV katalog (kolom Processor & GPU), mis. final_scrap.csv")
+    parser.add_argument("--cpu", nargs="+", default=["cpu_bm.csv"], help="CSV benchmark CPU (urutan = prioritas)")
+    parser.add_argument("--gpu", nargs="+", default=["gpu_benchmark_score.csv"], help="CSV benchmark GPU")
+    parser.add_argument("--output", default="dataset_final_super_lengkap.csv")
+    parser.add_argument("--report", help="simpan hasil match per nama unik (confidence, metode) ke CSV ini")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    build_dataset(args.catalog, args.cpu, args.gpu, args.output, args.workers, args.report)
+
+
+if __name__ == "__main__":
+    main()
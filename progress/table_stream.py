@@ -0,0 +1,164 @@
+import csv
+import hashlib
+import json
+import os
+from html.parser import HTMLParser
+
+# Ukuran potongan file yang dibaca per iterasi dan jumlah baris per batch tulis CSV
+CHUNK_SIZE = 1 << 16
+BATCH_SIZE = 1000
+
+
+class _TableParser(HTMLParser):
+    """Tokenizer HTML inkremental: mengumpulkan teks sel <td> per <tr> di dalam <tbody> target."""
+
+    def __init__(self, table_id=None, whole_document=False):
+        super().__init__(convert_charrefs=False)  # entitas dibiarkan mentah, pembersihan diatur pemanggil
+        self.table_id = table_id
+        self.armed = table_id is None  # tbody baru dihitung setelah tabel dengan id ini muncul
+        self.seen_body = whole_document  # True: baris diambil dari seluruh dokumen (tanpa <tbody>)
+        self.done = False
+        self.rows = []
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done: return
+        if not self.armed:
+            if ('id', self.table_id) in attrs: self.armed = True
+            return
+        if tag == 'tbody' and not self.seen_body: self.seen_body = True
+        elif not self.seen_body: return
+        elif tag == 'tr': self._row = []
+        elif tag == 'td' and self._row is not None: self._cell = []
+
+    def handle_endtag(self, tag):
+        if self.done or not self.seen_body: return
+        if tag == 'td' and self._cell is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+        elif tag == 'tbody':
+            self.done = True
+
+    def handle_data(self, data):
+        if self._cell is not None: self._cell.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name):
+        self.handle_data(f"&#{name};")
+
+
+def iter_rows(filename, table_id=None, chunk_size=CHUNK_SIZE, fallback_document=False):
+    # Generator baris (list teks sel) dari <tbody> pertama (setelah elemen id=table_id jika diberikan).
+    # File dibaca per potongan, dan pembacaan berhenti begitu </tbody> target tertutup.
+    # fallback_document=True: jika tidak ada <tbody>, baris diambil dari seluruh dokumen (pass kedua).
+    parser = _TableParser(table_id)
+    yield from _feed(parser, filename, chunk_size)
+
+    if not parser.armed: raise ValueError(f"Tabel dengan ID '{table_id}' tidak ditemukan dalam file HTML.")
+    if not parser.seen_body:
+        if not fallback_document: raise ValueError("Tag <tbody> tidak ditemukan dalam tabel.")
+        yield from _feed(_TableParser(table_id, whole_document=True), filename, chunk_size)
+
+
+def _feed(parser, filename, chunk_size):
+    with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            parser.feed(chunk)
+            yield from parser.rows
+            parser.rows.clear()
+            if parser.done: break
+        else:
+            parser.close()
+            yield from parser.rows
+
+
+def file_hash(filename):
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def row_hash(cells):
+    return hashlib.sha1("\x1f".join(cells).encode('utf-8')).hexdigest()[:16]
+
+
+def state_path(output):
+    return f"{output}.state.json"
+
+
+def delta_path(output):
+    base, ext = os.path.splitext(output)
+    return f"{base}_delta{ext}"
+
+
+def _load_state(output):
+    try:
+        with open(state_path(output), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_header(path, headers):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f, lineterminator='\n').writerow(headers)
+    os.replace(tmp, path)
+
+
+def scrape_to_csv(filename, output, headers, clean_cell, table_id=None, min_cols=5, batch_size=BATCH_SIZE,
+                  fallback_document=False):
+    # Ekstrak tabel benchmark ke CSV secara streaming (memori terbatas pada satu batch).
+    # Hash isi file & hash tiap baris dari run sebelumnya disimpan di <output>.state.json:
+    # file sama -> tidak diproses ulang; baris baru/berubah saja yang ditulis ke <output>_delta.csv.
+    state = _load_state(output)
+    sumber = file_hash(filename)
+    if state.get("source") == sumber and os.path.exists(output):
+        # Tidak ada yang berubah: delta run sebelumnya dikosongkan agar tidak diproses ulang
+        _write_header(delta_path(output), headers)
+        return {"skipped": True, "rows": state.get("count", 0), "changed": 0, "removed": 0}
+
+    lama = set(state.get("rows", []))
+    hashes = []
+    changed = 0
+    tmp, tmp_delta = f"{output}.tmp", f"{delta_path(output)}.tmp"
+    try:
+        with open(tmp, 'w', newline='', encoding='utf-8') as f, open(tmp_delta, 'w', newline='', encoding='utf-8') as fd:
+            writer, writer_delta = csv.writer(f, lineterminator='\n'), csv.writer(fd, lineterminator='\n')
+            writer.writerow(headers)
+            writer_delta.writerow(headers)
+            batch, batch_delta = [], []
+            for cells in iter_rows(filename, table_id, fallback_document=fallback_document):
+                if len(cells) < min_cols: continue
+                h = row_hash(cells[:len(headers)])
+                hashes.append(h)
+                row = [clean_cell(c) for c in cells[:len(headers)]]
+                batch.append(row)
+                if h not in lama:
+                    batch_delta.append(row)
+                    changed += 1
+                if len(batch) >= batch_size:
+                    writer.writerows(batch)
+                    writer_delta.writerows(batch_delta)
+                    batch, batch_delta = [], []
+            writer.writerows(batch)
+            writer_delta.writerows(batch_delta)
+    except BaseException:
+        for p in (tmp, tmp_delta):
+            if os.path.exists(p): os.remove(p)
+        raise
+
+    # Ganti file lama secara atomik, baru kemudian simpan state run ini
+    os.replace(tmp, output)
+    os.replace(tmp_delta, delta_path(output))
+    with open(state_path(output), 'w', encoding='utf-8') as f:
+        json.dump({"source": sumber, "count": len(hashes), "rows": hashes}, f)
+    return {"skipped": False, "rows": len(hashes), "changed": changed, "removed": len(lama - set(hashes))}
@@ -0,0 +1,79 @@
+import threading
+
+import numpy as np
+
+# Jika halaman yang diminta sudah melewati fraksi ini dari total kandidat, full sort lebih murah
+FULL_SORT_RATIO = 0.25
+
+
+class RankingCursor:
+    """Ranking kandidat yang diurutkan secara bertahap (top-K) sesuai kebutuhan pagination.
+
+    Urutan yang dihasilkan identik dengan `np.argsort(kunci, kind='stable')`: kunci kecil dulu,
+    kunci sama -> index kandidat kecil dulu, NaN selalu di akhir. Halaman berikutnya
+    memperpanjang prefix yang sudah terurut, bukan mengurutkan ulang dari awal.
+    """
+
+    def __init__(self, posisi, nilai, kunci=None):
+        self.posisi = posisi  # posisi baris katalog (terurut harga)
+        self.nilai = nilai    # nilai SAW per kandidat
+        self.kunci = kunci    # None = urutan kandidat apa adanya (mis. lowest_price)
+        self._lock = threading.Lock()
+        if kunci is None:
+            self._terurut = np.arange(len(posisi))
+            self._sisa = None
+        else:
+            self._terurut = np.empty(0, dtype=np.int64)
+            self._sisa = np.ones(len(posisi), dtype=bool)
+
+    def __len__(self):
+        return len(self.posisi)
+
+    @property
+    def nbytes(self):
+        # _terurut tumbuh per halaman sampai n int64; dihitung penuh sejak awal karena LRUCache
+        # hanya mencatat ukuran saat put
+        total = self.posisi.nbytes + self.nilai.nbytes + len(self.posisi) * 8
+        if self.kunci is not None: total += self.kunci.nbytes + self._sisa.nbytes
+        return total
+
+    def ambil(self, start, end):
+        # Index kandidat (0..len-1) untuk peringkat [start, end)
+        end = min(end, len(self))
+        if end > len(self._terurut):
+            with self._lock:
+                if end > len(self._terurut): self._perpanjang(end)
+        return self._terurut[start:end]
+
+    def _perpanjang(self, end):
+        n = len(self)
+        # Perpanjang minimal dua kali lipat agar flip halaman berurutan teramortisasi
+        target = max(end, 2 * len(self._terurut))
+        if target >= n * FULL_SORT_RATIO:
+            self._terurut = np.argsort(self.kunci, kind='stable')
+            self._sisa[:] = False
+            return
+
+        sisa = np.flatnonzero(self._sisa)
+        kv = self.kunci[sisa]
+        valid = ~np.isnan(kv)
+        if not valid.all():
+            sisa, kv = sisa[valid], kv[valid]
+
+        k = target - len(self._terurut)
+        if k >= len(sisa):
+            baru = sisa[np.argsort(kv, kind='stable')]
+            # Kandidat NaN selalu paling akhir, berurutan sesuai index
+            nan = np.flatnonzero(self._sisa & np.isnan(self.kunci))
+            baru = np.concatenate([baru, nan])[:k]
+        else:
+            # k terkecil: semua yang < ambang + yang == ambang dengan index terkecil (tie-break stabil)
+            ambang = np.partition(kv, k - 1)[k - 1]
+            kurang = np.flatnonzero(kv < ambang)
+            sama = np.flatnonzero(kv == ambang)[:k - len(kurang)]
+            pilih = np.concatenate([kurang, sama])
+            pilih = pilih[np.lexsort((pilih, kv[pilih]))]
+            baru = sisa[pilih]
+
+        self._sisa[baru] = False
+        self._terurut = np.concatenate([self._terurut, baru])
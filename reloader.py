@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+
+
+class DatasetReloader:
+    """Memegang SistemPakarLaptop aktif dan membangun ulang di thread latar saat file dataset berubah.
+
+    Request mengambil referensi sekali di awal (`current()`), lalu swap cukup berupa satu assignment
+    atomik: request yang sedang berjalan selesai dengan versi lama, request baru memakai versi baru.
+    """
+
+    def __init__(self, file_path, factory, interval=5.0):
+        self.file_path = file_path
+        self.factory = factory      # file_path -> SistemPakarLaptop
+        self.interval = interval    # detik antar pengecekan file; 0 = tanpa watcher
+        self.versi = 0              # naik setiap swap, untuk invalidasi cache turunan
+        self.sistem = None
+        self.error = None
+        self._stat = None
+        self._lock = threading.Lock()  # satu rebuild dalam satu waktu
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _stat_file(self):
+        try:
+            st = os.stat(self.file_path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def load(self):
+        # Bangun state baru; gagal atau dataset kosong -> versi lama tetap dipakai
+        with self._lock:
+            stat = self._stat_file()
+            try:
+                baru = self.factory(self.file_path)
+            except Exception as e:
+                self.error = e
+                print(f"Error memuat sistem: {e}")
+                return False
+            finally:
+                self._stat = stat
+            if baru.data.empty:
+                lama = f"tetap memakai versi {self.versi}" if self.sistem is not None else "menunggu file valid"
+                print(f"Dataset {self.file_path} kosong/gagal dibaca, {lama}.")
+                return False
+            self.swap(baru)
+            return True
+
+    def swap(self, sistem):
+        self.sistem = sistem
+        self.error = None
+        self.versi += 1
+
+    def check(self):
+        # Rebuild jika mtime/ukuran file berubah sejak load terakhir
+        stat = self._stat_file()
+        if stat is not None and stat != self._stat: return self.load()
+        return False
+
+    def current(self):
+        # Watcher dimulai per proses (thread tidak ikut ter-fork ke worker gunicorn)
+        if self._pid != os.getpid() and self.interval > 0: self.start()
+        return self.sistem
+
+    def start(self):
+        with self._start_lock:
+            if self._pid == os.getpid(): return
+            self._pid = os.getpid()
+            threading.Thread(target=self._loop, name="dataset-reloader", daemon=True).start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            try: self.check()
+            except Exception as e: print(f"Error reload dataset: {e}")
@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import snapshot
+
+
+class _KolomTeks:
+    # Kolom string di atas mmap: kode per baris + tabel string unik (blob UTF-8 + offset)
+    def __init__(self, target, i, nama):
+        self.name = nama
+        self.codes = np.load(os.path.join(target, f"{i}.codes.npy"), mmap_mode='r')
+        self.offsets = np.load(os.path.join(target, f"{i}.offsets.npy"), mmap_mode='r')
+        self.blob = snapshot.map_blob(target, i)
+
+    def take(self, baris):
+        # Decode hanya baris yang diminta (tiap string unik sekali); tidak ada salinan kolom per worker
+        kode_unik, posisi = np.unique(self.codes[baris], return_inverse=True)
+        tabel = np.empty(len(kode_unik), dtype=object)
+        ada = kode_unik >= 0
+        tabel[~ada] = np.nan
+        tabel[ada] = self._decode(kode_unik[ada])
+        return tabel[posisi.reshape(-1)]
+
+    def _decode(self, kode):
+        # Byte semua string yang diminta dikumpulkan sekali (dipisah NUL), lalu satu decode + split
+        awal = np.asarray(self.offsets[kode])
+        panjang = np.asarray(self.offsets[kode + 1]) - awal
+        ukuran = panjang + 1
+        mulai = np.cumsum(ukuran) - ukuran
+        seg = np.repeat(np.arange(len(kode)), ukuran)
+        geser = np.arange(int(ukuran.sum())) - mulai[seg]
+        isi = geser < panjang[seg]
+        buf = np.zeros(len(seg), dtype=np.uint8)
+        buf[isi] = self.blob[(awal[seg] + geser)[isi]]
+        teks = buf.tobytes().decode('utf-8').split('\x00')[:-1]
+        if len(teks) == len(kode): return teks
+        # String yang mengandung NUL: decode satu per satu
+        return [self.blob[a:a + n].tobytes().decode('utf-8') for a, n in zip(awal.tolist(), panjang.tolist())]
+
+
+class _KolomAngka:
+    def __init__(self, target, i, nama):
+        self.name = nama
+        self.values = np.load(os.path.join(target, f"{i}.npy"), mmap_mode='r')
+
+    def take(self, baris):
+        return np.asarray(self.values[baris])
+
+
+class _Kolom:
+    # Adapter minimal agar `katalog['Kolom'].iloc[...]` tetap bekerja seperti pada DataFrame
+    def __init__(self, kolom, n):
+        self._kolom = kolom
+        self._n = n
+
+    @property
+    def iloc(self):
+        return self
+
+    def __getitem__(self, key):
+        # Slice cukup diubah jadi range sepanjang hasilnya, tanpa membuat arange(n) per panggilan
+        if isinstance(key, slice):
+            baris = np.arange(*key.indices(self._n))
+        else:
+            baris = np.asarray(key)
+            if baris.dtype == bool: baris = np.flatnonzero(baris)
+            baris = np.where(baris < 0, baris + self._n, baris)
+        return pd.Series(self._kolom.take(baris), name=self._kolom.name)
+
+
+class SharedKatalog:
+    """Katalog read-only yang dibaca langsung dari snapshot mmap.
+
+    Semua worker yang memetakan snapshot yang sama berbagi page cache yang sama,
+    sehingga menambah worker hampir tidak menambah memori. Hanya baris yang
+    diminta (mis. satu halaman hasil) yang diubah menjadi DataFrame.
+    """
+
+    def __init__(self, target, meta):
+        self.target = target
+        self.n = meta["rows"]
+        self._kolom = {}
+        for i, info in enumerate(meta["columns"]):
+            kelas = _KolomAngka if info["kind"] == "num" else _KolomTeks
+            self._kolom[info["name"]] = kelas(target, i, info["name"])
+        self.columns = pd.Index(list(self._kolom))
+        self.arrays = snapshot.load_arrays(target, meta)
+
+    @classmethod
+    def open(cls, file_path, key):
+        target = snapshot.snapshot_path(file_path, key)
+        meta = snapshot.read_meta(target, key)
+        return cls(target, meta) if meta is not None else None
+
+    @property
+    def empty(self):
+        return self.n == 0 or len(self._kolom) == 0
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, col):
+        return _Kolom(self._kolom[col], self.n)
+
+    def take(self, baris):
+        baris = np.asarray(baris, dtype=np.int64)
+        return pd.DataFrame({nama: kolom.take(baris) for nama, kolom in self._kolom.items()},
+                            index=pd.RangeIndex(len(baris)))
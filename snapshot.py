@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Naikkan jika layout file snapshot berubah agar snapshot lama otomatis dibangun ulang
+FORMAT_VERSION = 4
+
+
+def content_hash(file_path, extra=""):
+    # Hash isi CSV (dibaca per blok) + parameter loader yang mempengaruhi hasil cleaning
+    h = hashlib.sha256()
+    h.update(f"v{FORMAT_VERSION}|{extra}|".encode('utf-8'))
+    with open(file_path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    return h.hexdigest()[:32]
+
+
+def snapshot_dir(file_path):
+    return f"{file_path}.snapshot"
+
+
+def snapshot_path(file_path, key):
+    return os.path.join(snapshot_dir(file_path), key)
+
+
+def save_snapshot(df, file_path, key, arrays=None):
+    # Tulis ke folder sementara lalu rename, sehingga pembaca tidak pernah melihat snapshot setengah jadi
+    root = snapshot_dir(file_path)
+    target = snapshot_path(file_path, key)
+    tmp = f"{target}.tmp-{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+
+    meta = {"key": key, "rows": len(df), "columns": [], "arrays": sorted(arrays or {})}
+    for i, col in enumerate(df.columns):
+        values = df[col].to_numpy()
+        if values.dtype.kind in 'biuf':
+            np.save(os.path.join(tmp, f"{i}.npy"), np.ascontiguousarray(values))
+            meta["columns"].append({"name": col, "kind": "num"})
+        else:
+            # Layout ala Arrow dengan dictionary encoding: kode int32 + tabel string unik
+            # (blob UTF-8 + offset byte). Kode -1 = null.
+            codes, uniques = pd.factorize(df[col])
+            teks = [str(v).encode('utf-8') for v in uniques]
+            offsets = np.zeros(len(teks) + 1, dtype=np.int64)
+            np.cumsum([len(t) for t in teks], out=offsets[1:])
+            with open(os.path.join(tmp, f"{i}.blob"), 'wb') as f:
+                f.write(b"".join(teks))
+            np.save(os.path.join(tmp, f"{i}.offsets.npy"), offsets)
+            np.save(os.path.join(tmp, f"{i}.codes.npy"), codes.astype(np.int32))
+            meta["columns"].append({"name": col, "kind": "str"})
+
+    # Array turunan (mis. index katalog) ikut disimpan agar tidak perlu dihitung ulang
+    for nama, arr in (arrays or {}).items():
+        np.save(os.path.join(tmp, f"arr_{nama}.npy"), np.ascontiguousarray(arr))
+
+    with open(os.path.join(tmp, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(target, ignore_errors=True)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # Mis. proses lain sudah me-rename key yang sama lebih dulu; folder .tmp- tidak ikut dibersihkan di bawah
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    # Bersihkan snapshot dari versi CSV sebelumnya
+    for nama in os.listdir(root):
+        if nama != key and '.tmp-' not in nama and not nama.startswith('.'):
+            shutil.rmtree(os.path.join(root, nama), ignore_errors=True)
+    return target
+
+
+@contextmanager
+def build_lock(file_path):
+    # Kunci antar proses (mis. worker gunicorn yang reload bersamaan) agar snapshot hanya dibangun sekali
+    try:
+        import fcntl
+    except ImportError:  # Windows: tanpa kunci, paling buruk snapshot dibangun lebih dari sekali
+        yield
+        return
+    os.makedirs(snapshot_dir(file_path), exist_ok=True)
+    with open(os.path.join(snapshot_dir(file_path), ".lock"), 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def read_meta(target, key):
+    try:
+        with open(os.path.join(target, "meta.json"), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("key") == key else None
+
+
+def map_blob(target, i):
+    # Blob kosong tidak bisa di-mmap, jadi kembalikan array kosong biasa
+    path = os.path.join(target, f"{i}.blob")
+    if os.path.getsize(path) == 0: return np.empty(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode='r')
+
+
+def load_string_table(target, i):
+    # Tabel string unik kolom ke-i; elemen terakhir NaN agar kode -1 langsung menjadi null
+    offsets = np.load(os.path.join(target, f"{i}.offsets.npy")).tolist()
+    with open(os.path.join(target, f"{i}.blob"), 'rb') as f:
+        blob = f.read()
+    table = np.empty(len(offsets), dtype=object)
+    table[:-1] = [blob[a:b].decode('utf-8') for a, b in zip(offsets, offsets[1:])]
+    table[-1] = np.nan
+    return table
+
+
+def load_arrays(target, meta):
+    return {nama: np.load(os.path.join(target, f"arr_{nama}.npy"), mmap_mode='r') for nama in meta["arrays"]}
+
+
+def load_snapshot(file_path, key, kolom=None, kategori=False):
+    # Kembalikan (DataFrame, array turunan) dari snapshot yang cocok dengan key, atau None.
+    # kolom = hanya muat kolom ini; kategori=True -> kolom string langsung jadi Categorical dari kode snapshot
+    target = snapshot_path(file_path, key)
+    meta = read_meta(target, key)
+    if meta is None: return None
+
+    data = {}
+    for i, info in enumerate(meta["columns"]):
+        if kolom is not None and info["name"] not in kolom: continue
+        if info["kind"] == "num":
+            data[info["name"]] = np.load(os.path.join(target, f"{i}.npy"), mmap_mode='r')
+        else:
+            table = load_string_table(target, i)
+            codes = np.load(os.path.join(target, f"{i}.codes.npy"), mmap_mode='r')
+            data[info["name"]] = pd.Categorical.from_codes(codes, table[:-1]) if kategori else table[codes]
+    return pd.DataFrame(data), load_arrays(target, meta)
+
+
+def build(file_path):
+    # Dipakai saat deploy: bangun snapshot tanpa menjalankan Flask
+    from expertsystem import SistemPakarLaptop
+    sistem = SistemPakarLaptop(file_path, use_snapshot=False)
+    if sistem.data.empty:
+        print(f"Error: dataset {file_path} kosong atau gagal dimuat.")
+        return None
+    target = save_snapshot(sistem.data, file_path, sistem.snapshot_key(), sistem.index.arrays())
+    print(f"Snapshot {len(sistem.data)} baris disimpan ke: {target}")
+    return target
+
+
+if __name__ == "__main__":
+    build(sys.argv[1] if len(sys.argv) > 1 else "dataset_final_super_lengkap.csv")
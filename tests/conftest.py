@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark  # noqa: E402
+from expertsystem import SistemPakarLaptop  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def katalog_csv(tmp_path_factory):
+    # Katalog sintetis kecil dengan format mentah yang sama seperti CSV asli
+    path = tmp_path_factory.mktemp("katalog") / "katalog.csv"
+    benchmark.generate_catalog(2000, seed=1).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def sistem(katalog_csv):
+    return SistemPakarLaptop(katalog_csv, use_snapshot=False)
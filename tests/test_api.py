@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+os.environ.setdefault("LAPTOP_RELOAD_INTERVAL", "0")
+
+import app as web  # noqa: E402
+
+
+@pytest.fixture
+def client(sistem, monkeypatch):
+    monkeypatch.setattr(web.reloader, "current", lambda: sistem)
+    return web.app.test_client()
+
+
+QUERY = {"budget": 15000000, "category": "GAMING_BERAT", "sub_category": "indie"}
+
+
+@pytest.mark.parametrize("body", [
+    [QUERY],
+    {"queries": [dict(QUERY, category=["x"])]},
+    {"queries": [dict(QUERY, brand_filter=["a"])]},
+    {"queries": [dict(QUERY, search_query=5)]},
+    {"queries": [dict(QUERY, budget=[1])]},
+    {"queries": [dict(QUERY, page="x")]},
+    {"queries": ["bukan object"]},
+])
+def test_batch_input_tidak_valid(client, body):
+    resp = client.post("/api/recommend/batch", json=body)
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+def test_budget_float_sama_dengan_int(client, sistem):
+    resp = client.post("/api/recommend/batch", json={"queries": [QUERY, dict(QUERY, budget=15000000.0)]})
+    assert resp.status_code == 200
+    a, b = resp.get_json()["results"]
+    assert a == b
+    assert a["total_items"] == sistem.rekomendasi(15000000, "GAMING_BERAT", "indie")["total_items"]
+
+
+def test_get_budget_format_form(client):
+    a = client.get("/api/recommend?budget=15.000.000&category=GAMING_BERAT&sub_category=indie").get_json()
+    b = client.get("/api/recommend?budget=15000000&category=GAMING_BERAT&sub_category=indie").get_json()
+    assert a == b and a["total_items"] > 0
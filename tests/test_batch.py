@@ -0,0 +1,37 @@
+import pytest
+
+import benchmark
+from expertsystem import SistemPakarLaptop
+
+DASAR = dict(user_budget_idr=50_000_000, user_kategori="GAMING_BERAT", user_sub_kategori="indie")
+QUERIES = [
+    dict(DASAR),
+    dict(DASAR, user_kategori="TIDAK_ADA"),
+    dict(DASAR, user_sub_kategori="tidak_ada"),
+    dict(DASAR, search_query="legion"),
+    dict(DASAR, search_query="legion", sort_option="lowest_price"),
+    dict(DASAR, user_kategori="SHOW_ALL", user_sub_kategori=None, search_query="legion", page=2, per_page=5),
+    dict(DASAR, sort_option="best_value", page=3),
+    dict(DASAR, sort_option="highest_price", page=999),
+    dict(DASAR, brand_filter="ASUS", search_query="rtx"),
+    dict(DASAR, user_budget_idr=3_000_000),
+    dict(DASAR),
+    dict(DASAR, page=2, per_page=7),
+    dict(DASAR, user_kategori="PROGRAMMER_CODING", user_sub_kategori="web_mobile", search_query="pro 14"),
+]
+
+
+@pytest.mark.parametrize("max_items", [512, 2, 1])
+def test_batch_sama_dengan_per_query(katalog_csv, max_items):
+    # max_items kecil: entry ranking tergusur LRU di tengah batch dan harus dihitung ulang
+    batch = SistemPakarLaptop(katalog_csv, use_snapshot=False)
+    batch.ranking_cache.max_items = max_items
+    tunggal = SistemPakarLaptop(katalog_csv, use_snapshot=False)
+
+    hasil = batch.rekomendasi_batch(QUERIES)
+    assert len(hasil) == len(QUERIES)
+    for q, h in zip(QUERIES, hasil):
+        q = dict(q)
+        acuan = tunggal.rekomendasi(q.pop("user_budget_idr"), q.pop("user_kategori"), q.pop("user_sub_kategori"), **q)
+        assert benchmark._hasil_sama(h, acuan), q
+    if max_items < len(QUERIES): assert batch.ranking_cache.evictions > 0
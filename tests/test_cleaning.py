@@ -0,0 +1,62 @@
+import re
+
+import pandas as pd
+
+import benchmark
+from expertsystem import SistemPakarLaptop
+
+
+def _bersihkan_lama(sistem):
+    # Cleaning lama (apply per baris) sebagai referensi. Kolom teks dicek dengan is_numeric_dtype, bukan
+    # dtype == 'object', agar referensi tetap membersihkan "$1,299.99" di pandas 3 (dtype 'str')
+    df = pd.read_csv(sistem.file_path, encoding='utf-8', low_memory=False)
+    column_map = {'Harga_USD': 'Harga', 'CPU_Score': 'CpuScore', 'GPU_Score': 'GpuScore', 'RAM_Clean': 'RAM', 'Storage': 'Storage_GB', 'Nama_Laptop': 'Nama_Produk', 'Screen_Score': 'ScreenScore', 'Processor': 'TipeProcessor', 'GPU': 'TipeGPU', 'Display': 'DetailLayar', 'Detail_URL': 'LinkPenjelasan', 'Buy_Link': 'LinkPembelian'}
+    df = df.rename(columns={k: v for k, v in column_map.items() if k in df.columns})
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    for col in ['Harga', 'CpuScore', 'GpuScore', 'RAM', 'Storage_GB', 'ScreenScore']:
+        if col not in df.columns: df[col] = 0
+        if not pd.api.types.is_numeric_dtype(df[col]): df[col] = df[col].astype(str).str.replace(r'[^\d.]', '', regex=True)
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    def extract_hz(text):
+        if not isinstance(text, str): return 60
+        match = re.search(r'(\d+)\s*Hz', text, re.IGNORECASE)
+        return int(match.group(1)) if match else 60
+    df['RefreshRate'] = df['DetailLayar'].apply(extract_hz)
+
+    def identify_brand(product_name):
+        if not isinstance(product_name, str): return "Other"
+        name_upper = product_name.upper()
+        for brand in sistem.TARGET_BRANDS:
+            if brand.upper() in name_upper:
+                return brand
+        return "Other"
+    df['Brand'] = df['Nama_Produk'].apply(identify_brand)
+    return df
+
+
+def test_cleaning_sama_dengan_apply(tmp_path):
+    path = tmp_path / "katalog.csv"
+    df = benchmark.generate_catalog(5000, seed=2)
+    # Nilai tepi: harga kosong/teks, layar non-teks & "Hz" tanpa spasi/huruf kecil, nama kosong
+    df.loc[:4, 'Harga_USD'] = ["", "N/A", "$12,345.67", "1.299,00", "abc"]
+    df.loc[:2, 'Display'] = [None, "120hz", "15.6 inch 60 Hz 144Hz"]
+    df.loc[:1, 'Nama_Laptop'] = [None, "alienware m16"]
+    df.to_csv(path, index=False)
+
+    sistem = SistemPakarLaptop(str(path), use_snapshot=False)
+    lama, baru = _bersihkan_lama(sistem), sistem._load_and_clean_data()
+    assert list(baru.columns) == list(lama.columns)
+    pd.testing.assert_frame_equal(baru, lama, check_dtype=False)
+    for col in ['Harga', 'CpuScore', 'GpuScore', 'RAM', 'Storage_GB', 'ScreenScore', 'RefreshRate']:
+        assert baru[col].dtype == lama[col].dtype, col
+    # Harga "$1,299.99" ikut ter-parse (bukan 0); hanya "", "N/A", dan "abc" yang jadi 0
+    assert (baru['Harga'] == 0).sum() == 3
+
+
+def test_snapshot_key_memuat_versi_loader(katalog_csv, monkeypatch):
+    sistem = SistemPakarLaptop(katalog_csv, use_snapshot=False)
+    lama = sistem.snapshot_key()
+    monkeypatch.setattr(SistemPakarLaptop, "LOADER_VERSION", SistemPakarLaptop.LOADER_VERSION + 1)
+    assert sistem.snapshot_key() != lama
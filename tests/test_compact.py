@@ -0,0 +1,35 @@
+import pytest
+
+import benchmark
+import snapshot
+from expertsystem import SistemPakarLaptop
+
+
+@pytest.fixture(params=["dataframe", "snapshot"])
+def compact(request, katalog_csv, tmp_path, monkeypatch):
+    if request.param == "dataframe":
+        return SistemPakarLaptop(katalog_csv, use_snapshot=False, compact=True)
+
+    path = tmp_path / "katalog.csv"
+    path.write_bytes(open(katalog_csv, 'rb').read())
+    SistemPakarLaptop(str(path))  # bangun snapshot lengkap dulu
+    dipakai = []
+    asli = snapshot.load_snapshot
+    def load(*args, **kwargs):
+        hasil = asli(*args, **kwargs)
+        dipakai.append((kwargs, hasil is not None))
+        return hasil
+    monkeypatch.setattr(snapshot, "load_snapshot", load)
+    sistem = SistemPakarLaptop(str(path), compact=True)
+    assert dipakai == [({"kolom": SistemPakarLaptop.KOLOM_COMPACT, "kategori": True}, True)]
+    return sistem
+
+
+def test_compact_ranking_tidak_berubah(sistem, compact):
+    # Semua rule x sort, pagination, search & brand (skenario benchmark) di halaman 1 dan 2
+    assert compact.data.memory_usage(deep=True).sum() < sistem.data.memory_usage(deep=True).sum()
+    for nama, kwargs in benchmark.query_scenarios(sistem):
+        for page in (1, 2):
+            kw = dict(kwargs, per_page=24, page=kwargs.get("page", page))
+            assert benchmark._hasil_sama(compact.rekomendasi(benchmark.BUDGET, **kw),
+                                         sistem.rekomendasi(benchmark.BUDGET, **kw)), (nama, page)
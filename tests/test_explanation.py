@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+
+def _kandidat(sistem):
+    # Baris katalog + baris batas: GpuScore tepat 2000 / 2001 dan RefreshRate tepat 60 / 61
+    df = sistem.data.head(200).copy()
+    batas = pd.DataFrame({
+        'Harga': [499.99, 500.0, 1299.5, 0.0],
+        'CpuScore': [9594.9, 16225, 0, 30562],
+        'GpuScore': [2000, 2001, 2000.5, 0],
+        'RAM': [8, 16, 4, 32],
+        'ScreenScore': [80, 60, 120, 0],
+        'RefreshRate': [60, 61, 60, 165],
+    })
+    df = pd.concat([df, batas], ignore_index=True)
+    df['Nilai_Rekomendasi'] = np.linspace(0, 1, len(df))
+    return df
+
+
+def test_batch_sama_dengan_per_baris(sistem):
+    candidates = _kandidat(sistem)
+    for kategori, subs in sistem.rules.items():
+        for sub, rule in subs.items():
+            lama = candidates.apply(sistem._generate_explanation, axis=1, args=(rule, kategori)).tolist()
+            baru = sistem._generate_explanation_batch(candidates, rule, kategori)
+            assert baru == lama, (kategori, sub)
+
+
+def test_batch_kosong(sistem):
+    rule = sistem.rules["GAMING_BERAT"]["indie"]
+    assert sistem._generate_explanation_batch(_kandidat(sistem).iloc[:0], rule, "GAMING_BERAT") == []
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from expertsystem import SistemPakarLaptop
+from ranking import FULL_SORT_RATIO, RankingCursor
+
+
+def _kunci(rng, n):
+    # Banyak nilai kembar + NaN, +-inf, dan -0.0 (sama dengan 0.0 untuk argsort)
+    kunci = rng.integers(0, max(n // 20, 2), n).astype(np.float64) / 4
+    khusus = rng.random(n)
+    kunci[khusus < 0.05] = np.nan
+    kunci[(khusus >= 0.05) & (khusus < 0.08)] = np.inf
+    kunci[(khusus >= 0.08) & (khusus < 0.11)] = -np.inf
+    kunci[(khusus >= 0.11) & (khusus < 0.15)] = -0.0
+    kunci[(khusus >= 0.15) & (khusus < 0.19)] = 0.0
+    return kunci
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ambil_sama_dengan_argsort_stabil(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 3000))
+    kunci = _kunci(rng, n)
+    acuan = np.argsort(kunci, kind='stable')
+    cursor = RankingCursor(np.arange(n), rng.random(n), kunci)
+
+    per_page = int(rng.integers(1, 50))
+    halaman = rng.permutation(-(-n // per_page))
+    # Halaman acak (tidak berurutan) sampai lewat batas FULL_SORT_RATIO, lalu semua halaman sekali lagi
+    for page in list(halaman[:max(3, int(len(halaman) * FULL_SORT_RATIO) + 2)]) + list(halaman):
+        start = int(page) * per_page
+        assert np.array_equal(cursor.ambil(start, start + per_page), acuan[start:start + per_page]), (seed, page)
+
+
+def test_halaman_jauh_lalu_awal():
+    rng = np.random.default_rng(99)
+    kunci = _kunci(rng, 10000)
+    acuan = np.argsort(kunci, kind='stable')
+    cursor = RankingCursor(np.arange(10000), np.zeros(10000), kunci)
+    for start, end in [(40, 60), (0, 20), (2400, 2420), (20, 40), (9990, 10020), (0, 10000)]:
+        assert np.array_equal(cursor.ambil(start, end), acuan[start:end])
+
+
+def test_tanpa_kunci_urutan_apa_adanya():
+    cursor = RankingCursor(np.array([4, 7, 9]), np.zeros(3))
+    assert cursor.ambil(1, 10).tolist() == [1, 2]
+
+
+def test_skor_sama_lebih_murah_dulu(tmp_path):
+    # Spesifikasi identik -> nilai SAW sama; urutan stabil atas katalog terurut harga = termurah dulu
+    path = tmp_path / "katalog.csv"
+    pd.DataFrame({
+        "Nama_Laptop": ["ASUS Mahal", "ASUS Murah", "ASUS Sedang"],
+        "Harga_USD": [1500.0, 900.0, 1200.0],
+        "CPU_Score": [20000] * 3, "GPU_Score": [8000] * 3, "RAM_Clean": [16] * 3, "Storage": [512] * 3,
+        "Screen_Score": [80] * 3, "Display": ["15.6 inch 144Hz"] * 3, "Processor": ["i7"] * 3, "GPU": ["RTX"] * 3,
+        "Detail_URL": ["-"] * 3, "Buy_Link": ["-"] * 3,
+    }).to_csv(path, index=False)
+    sistem = SistemPakarLaptop(str(path), use_snapshot=False)
+    hasil = sistem.rekomendasi(50_000_000, "GAMING_BERAT", "indie")
+    assert [r["Nama_Produk"] for r in hasil["data"]] == ["ASUS Murah", "ASUS Sedang", "ASUS Mahal"]
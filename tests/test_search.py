@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import benchmark
+from expertsystem import SistemPakarLaptop
+
+NAMA_KHUSUS = ["ASUS (2023) Zenbook 14.5\"", "Dell XPS 13.4 (9340)", "MSI a.b.c", "Ünïcode Läptop Pro",
+               "  Lenovo  Legion   Pro 7i ", "HP 15-fd0000 (i5)", "Acer ((double)) ..", "ab", "A", "x y"]
+QUERIES = ["(", ".", ")", "..", "(2", "3.", "a", "A", "ro", "ün", "o 1", " 1", "y", "x y", " ", "  l",
+           "pro 14", "legion", "LEGION", "legion   pro", "zenbook 14.5", "xps 13.4 (9340)", "(i5)", "zzzz", "a.b.c"]
+
+
+@pytest.fixture(scope="module")
+def sistem(tmp_path_factory):
+    df = benchmark.generate_catalog(3000, seed=3)
+    baris = np.random.default_rng(3).choice(len(df), 200, replace=False)
+    df.loc[baris, "Nama_Laptop"] = np.resize(NAMA_KHUSUS, len(baris))
+    path = tmp_path_factory.mktemp("search") / "katalog.csv"
+    df.to_csv(path, index=False)
+    return SistemPakarLaptop(str(path), use_snapshot=False)
+
+
+@pytest.mark.parametrize("q", QUERIES)
+def test_search_sama_dengan_contains_literal(sistem, q):
+    nama = sistem.data["Nama_Produk"]
+    for batas in [0, 1, 500, sistem.index.n // 2, sistem.index.n]:
+        acuan = nama.iloc[:batas].str.lower().str.contains(q.lower(), regex=False, na=False).to_numpy(dtype=bool)
+        assert np.array_equal(sistem._search_mask(q, batas), acuan), (q, batas)
+
+
+def test_search_lewat_rekomendasi_terpotong_budget(sistem):
+    budget = 200_000  # sekitar 1300 USD: hanya sebagian katalog
+    batas = sistem.index.batas_budget((budget / sistem.KONVERSI_FACTOR) * 1.1)
+    assert 0 < batas < sistem.index.n
+    hasil = sistem.rekomendasi(budget, "SHOW_ALL", None, search_query="(", per_page=10_000)
+    nama = sistem.data["Nama_Produk"].iloc[:batas]
+    assert hasil["total_items"] == nama.str.contains("(", regex=False, na=False).sum() > 0
+
+
+def test_nama_numerik(tmp_path):
+    # Kolom nama yang ter-parse sebagai angka tidak boleh menggagalkan load (search nama tidak menemukan apa pun)
+    path = tmp_path / "katalog.csv"
+    pd.DataFrame({
+        "Nama_Laptop": [1, 2], "Harga_USD": [500.0, 900.0], "CPU_Score": [20000] * 2, "GPU_Score": [8000] * 2,
+        "RAM_Clean": [16] * 2, "Storage": [512] * 2, "Screen_Score": [80] * 2, "Display": ["144Hz"] * 2,
+        "Processor": ["i7"] * 2, "GPU": ["RTX"] * 2, "Detail_URL": ["-"] * 2, "Buy_Link": ["-"] * 2,
+    }).to_csv(path, index=False)
+    sistem = SistemPakarLaptop(str(path), use_snapshot=False)
+    assert sistem.rekomendasi(50_000_000, "SHOW_ALL", None)["total_items"] == 2
+    assert sistem.rekomendasi(50_000_000, "SHOW_ALL", None, search_query="legion")["total_items"] == 0
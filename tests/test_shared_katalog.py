@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+import benchmark
+from expertsystem import SistemPakarLaptop
+
+
+def test_kolom_sama_dengan_dataframe(katalog_csv, tmp_path):
+    path = tmp_path / "katalog.csv"
+    path.write_bytes(open(katalog_csv, 'rb').read())
+    df = SistemPakarLaptop(str(path)).data
+    shared = SistemPakarLaptop(str(path), shared=True).data
+
+    for col in ['Nama_Produk', 'TipeGPU', 'Harga']:
+        for key in [slice(None, 37), slice(10, 500, 7), slice(-5, None), np.array([3, 0, 3, 1999]), np.array([-1, 2])]:
+            pd.testing.assert_series_equal(shared[col].iloc[key], df[col].iloc[key].reset_index(drop=True),
+                                           check_dtype=False)
+    baris = np.array([5, 5, 1, 1500, 0])
+    pd.testing.assert_frame_equal(shared.take(baris), df.take(baris).reset_index(drop=True), check_dtype=False)
+
+
+def test_search_shared_sama_dengan_dataframe(katalog_csv, tmp_path):
+    path = tmp_path / "katalog.csv"
+    path.write_bytes(open(katalog_csv, 'rb').read())
+    df, shared = SistemPakarLaptop(str(path)), SistemPakarLaptop(str(path), shared=True)
+    for q in ["legion", "pro 14", "rtx", "a", "zz"]:
+        kwargs = dict(search_query=q, sort_option="best_value", page=2, per_page=10)
+        assert benchmark._hasil_sama(shared.rekomendasi(50_000_000, "GAMING_BERAT", "indie", **kwargs),
+                                     df.rekomendasi(50_000_000, "GAMING_BERAT", "indie", **kwargs)), q
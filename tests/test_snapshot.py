@@ -0,0 +1,32 @@
+import os
+
+import pandas as pd
+import pytest
+
+import snapshot
+from expertsystem import SistemPakarLaptop
+
+
+def test_rename_gagal_membersihkan_tmp(tmp_path, monkeypatch):
+    csv = tmp_path / "katalog.csv"
+    csv.write_text("x\n1\n")
+    df = pd.DataFrame({"Nama_Produk": ["a", "b"], "Harga": [1.0, 2.0]})
+
+    def rename_gagal(src, dst):
+        raise OSError(39, "Directory not empty")
+    monkeypatch.setattr(snapshot.os, "rename", rename_gagal)
+
+    with pytest.raises(OSError):
+        snapshot.save_snapshot(df, str(csv), "kunci")
+    assert os.listdir(snapshot.snapshot_dir(str(csv))) == []
+
+
+def test_snapshot_dipakai_ulang(katalog_csv, tmp_path):
+    path = tmp_path / "katalog.csv"
+    path.write_bytes(open(katalog_csv, 'rb').read())
+    pertama = SistemPakarLaptop(str(path))
+    assert os.path.isdir(snapshot.snapshot_path(str(path), pertama.snapshot_key()))
+
+    kedua = SistemPakarLaptop(str(path))
+    pd.testing.assert_frame_equal(kedua.data, pertama.data, check_dtype=False)
+    assert kedua.rekomendasi(50_000_000, "GAMING_BERAT", "indie") == pertama.rekomendasi(50_000_000, "GAMING_BERAT", "indie")
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "progress"))
+
+from table_stream import delta_path, iter_rows, scrape_to_csv  # noqa: E402
+
+HEADERS = ['Name', 'Mark', 'Rank', 'Value', 'Price']
+BARIS = "".join(f"<tr><td>CPU {i}</td><td>{i}00</td><td>{i}</td><td>1.0</td><td>$9</td></tr>" for i in range(5))
+
+
+def _tulis(path, html):
+    path.write_text(html, encoding='utf-8')
+    return str(path)
+
+
+def test_delta_dikosongkan_jika_sumber_tidak_berubah(tmp_path):
+    html = _tulis(tmp_path / "cpu.html", f"<table><thead><tr><th>x</th></tr></thead><tbody>{BARIS}</tbody></table>")
+    output = str(tmp_path / "cpu.csv")
+
+    pertama = scrape_to_csv(html, output, HEADERS, str.strip)
+    assert (pertama['skipped'], pertama['changed']) == (False, 5)
+    with open(delta_path(output), encoding='utf-8') as f: assert len(f.readlines()) == 6
+
+    kedua = scrape_to_csv(html, output, HEADERS, str.strip)
+    assert (kedua['skipped'], kedua['changed'], kedua['rows']) == (True, 0, 5)
+    with open(delta_path(output), encoding='utf-8') as f: assert f.read() == ",".join(HEADERS) + "\n"
+
+
+def test_tanpa_tbody(tmp_path):
+    html = _tulis(tmp_path / "cpu.html", f"<table>{BARIS}</table>")
+    with pytest.raises(ValueError):
+        list(iter_rows(html))
+    rows = list(iter_rows(html, fallback_document=True))
+    assert [r[0] for r in rows] == [f"CPU {i}" for i in range(5)]